@@ -1,61 +1,92 @@
-"""Dagster definitions for the GTFS-RT compaction pipeline."""
-
-import os
-
-import dagster as dg
-
-from dagster_pipeline.defs.assets import (
-    bucket_inventory,
-    feeds_metadata,
-    service_alerts_parquet,
-    trip_updates_parquet,
-    vehicle_positions_parquet,
-)
-from dagster_pipeline.defs.resources import GCSResource, SecretManagerResource
-from dagster_pipeline.defs.schedules import (
-    bucket_inventory_schedule,
-    inventory_job,
-    service_alerts_compaction_job,
-    service_alerts_schedule,
-    trip_updates_compaction_job,
-    trip_updates_schedule,
-    vehicle_positions_compaction_job,
-    vehicle_positions_schedule,
-)
-from dagster_pipeline.defs.sensors import feed_discovery_sensor
-
-defs = dg.Definitions(
-    assets=[
-        vehicle_positions_parquet,
-        trip_updates_parquet,
-        service_alerts_parquet,
-        feeds_metadata,
+"""Dagster definitions for the GTFS-RT compaction pipeline.
+
+The ``defs`` object is built lazily via PEP 562 module ``__getattr__`` so
+that importing ``dagster_pipeline.defs`` (e.g. from CLI tooling that only
+needs a submodule) does not pull in the full asset import graph -
+``google.cloud.storage``, ``pyarrow``, etc. - until Dagster actually asks
+for the definitions.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import dagster as dg
+
+
+def _build_defs() -> "dg.Definitions":
+    import os
+
+    import dagster as dg
+
+    from dagster_pipeline.defs.assets import (
         bucket_inventory,
-    ],
-    jobs=[
-        vehicle_positions_compaction_job,
-        trip_updates_compaction_job,
-        service_alerts_compaction_job,
+        feeds_metadata,
+        service_alerts_parquet,
+        trip_updates_parquet,
+        vehicle_positions_parquet,
+    )
+    from dagster_pipeline.defs.resources import GCSResource, SecretManagerResource
+    from dagster_pipeline.defs.schedules import (
+        bucket_inventory_schedule,
         inventory_job,
-    ],
-    schedules=[
-        vehicle_positions_schedule,
-        trip_updates_schedule,
+        service_alerts_compaction_job,
         service_alerts_schedule,
-        bucket_inventory_schedule,
-    ],
-    sensors=[
-        feed_discovery_sensor,
-    ],
-    resources={
-        "gcs": GCSResource(
-            project_id=os.environ.get("GCP_PROJECT_ID"),
-            protobuf_bucket=os.environ.get("GCS_BUCKET_RT_PROTOBUF", ""),
-            parquet_bucket=os.environ.get("GCS_BUCKET_RT_PARQUET", ""),
-        ),
-        "secret_manager": SecretManagerResource(
-            project_id=os.environ.get("GCP_PROJECT_ID", ""),
-            agencies_secret_id=os.environ.get("AGENCIES_SECRET_ID", "agencies-config"),
-        ),
-    },
-)
+        trip_updates_compaction_job,
+        trip_updates_schedule,
+        vehicle_positions_compaction_job,
+        vehicle_positions_schedule,
+    )
+    from dagster_pipeline.defs.sensors import feed_discovery_sensor
+
+    return dg.Definitions(
+        assets=[
+            vehicle_positions_parquet,
+            trip_updates_parquet,
+            service_alerts_parquet,
+            feeds_metadata,
+            bucket_inventory,
+        ],
+        jobs=[
+            vehicle_positions_compaction_job,
+            trip_updates_compaction_job,
+            service_alerts_compaction_job,
+            inventory_job,
+        ],
+        schedules=[
+            vehicle_positions_schedule,
+            trip_updates_schedule,
+            service_alerts_schedule,
+            bucket_inventory_schedule,
+        ],
+        sensors=[
+            feed_discovery_sensor,
+        ],
+        resources={
+            "gcs": GCSResource(
+                project_id=os.environ.get("GCP_PROJECT_ID"),
+                protobuf_bucket=os.environ.get("GCS_BUCKET_RT_PROTOBUF", ""),
+                parquet_bucket=os.environ.get("GCS_BUCKET_RT_PARQUET", ""),
+            ),
+            "secret_manager": SecretManagerResource(
+                project_id=os.environ.get("GCP_PROJECT_ID", ""),
+                agencies_secret_id=os.environ.get("AGENCIES_SECRET_ID", "agencies-config"),
+            ),
+        },
+    )
+
+
+# Cache lives in a dict so module attribute scans only ever see one
+# Definitions object (the "defs" attribute itself)
+_cache: dict[str, Any] = {}
+
+
+def __getattr__(name: str) -> Any:
+    if name == "defs":
+        if "defs" not in _cache:
+            _cache["defs"] = _build_defs()
+        return _cache["defs"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return [*globals().keys(), "defs"]
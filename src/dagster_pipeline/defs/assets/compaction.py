@@ -1,17 +1,22 @@
 """Compaction assets for converting protobuf archives to Parquet."""
 
 import base64
-import io
 import json
-import re
+import os
+from collections import deque
 from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from typing import Any
 
 import dagster as dg
 import pyarrow as pa
 import pyarrow.parquet as pq
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
+from google.protobuf.internal import api_implementation
 from google.protobuf.message import DecodeError
 from google.transit import gtfs_realtime_pb2
 
@@ -26,14 +31,21 @@ from dagster_pipeline.defs.partitions import (
     vehicle_positions_partitions,
 )
 from dagster_pipeline.defs.resources import GCSResource
+from dagster_pipeline.defs.resources.gcs import build_pooled_client
 
 
+@lru_cache(maxsize=4096)
 def decode_base64url(encoded: str) -> str:
-    """Decode base64url string (add padding back for decoding)."""
-    padded = encoded + "=" * (4 - len(encoded) % 4) if len(encoded) % 4 else encoded
+    """Decode base64url string (add padding back for decoding).
+
+    Memoized: callers loop over the same small set of feed identifiers
+    across dates, so each distinct token only decodes once per process.
+    """
+    padded = encoded + "=" * (-len(encoded) % 4)
     return base64.urlsafe_b64decode(padded).decode("utf-8")
 
 
+@lru_cache(maxsize=4096)
 def encode_base64url(url: str) -> str:
     """Encode URL to base64url (for GCS path lookup)."""
     return base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
@@ -53,10 +65,12 @@ def url_to_partition_key(url: str) -> str:
         https://example.com/feed -> example.com/feed
         http://example.com/feed -> ~example.com/feed
     """
-    if url.startswith("http://"):
-        return HTTP_FEED_PREFIX + url[7:]  # len("http://") = 7
-    elif url.startswith("https://"):
-        return url[8:]  # len("https://") = 8
+    # removeprefix does the test and the slice in one pass; HTTPS first
+    # since it is the overwhelmingly common scheme
+    if (stripped := url.removeprefix("https://")) != url:
+        return stripped
+    if (stripped := url.removeprefix("http://")) != url:
+        return HTTP_FEED_PREFIX + stripped
     return url  # No scheme, return as-is
 
 
@@ -67,18 +81,22 @@ def partition_key_to_url(key: str) -> str:
         example.com/feed -> https://example.com/feed
         ~example.com/feed -> http://example.com/feed
     """
-    if key.startswith(HTTP_FEED_PREFIX):
-        return "http://" + key[1:]
+    if (stripped := key.removeprefix(HTTP_FEED_PREFIX)) != key:
+        return "http://" + stripped
     return "https://" + key
 
 
-def discover_feed_urls(
+def iter_feed_urls(
     client: storage.Client,
     bucket_name: str,
     feed_type: str,
     date: str,
-) -> set[str]:
-    """Discover all unique base64url feed identifiers for a given date.
+) -> Iterator[str]:
+    """Yield unique base64url feed identifiers for a given date.
+
+    Identifiers are yielded as GCS list pages stream in, so callers can
+    overlap decode work with the remaining pagination instead of waiting
+    for the full listing to materialize.
 
     Args:
         client: GCS client
@@ -86,21 +104,51 @@ def discover_feed_urls(
         feed_type: Feed type (vehicle_positions, trip_updates, service_alerts)
         date: Date string in YYYY-MM-DD format
 
-    Returns:
-        Set of base64url-encoded feed URLs found for this date
+    Yields:
+        base64url-encoded feed URLs found for this date, deduplicated
     """
     bucket = client.bucket(bucket_name)
     prefix = f"{feed_type}/date={date}/"
 
-    feed_urls: set[str] = set()
-    for blob in bucket.list_blobs(prefix=prefix):
+    seen: set[str] = set()
+    # Bound retries so a stuck listing fails fast instead of hanging a worker.
+    # match_glob filters to .pb objects server-side (skipping .meta siblings)
+    # and the fields mask drops blob metadata the loop never reads.
+    for blob in bucket.list_blobs(
+        prefix=prefix,
+        match_glob=f"{prefix}**/*.pb",
+        fields="items(name),nextPageToken",
+        page_size=1000,
+        retry=DEFAULT_RETRY.with_timeout(60.0),
+    ):
         # Extract base64url from path
         # Pattern: {feed_type}/date=YYYY-MM-DD/hour=.../base64url={encoded}/...
-        match = re.search(r"base64url=([A-Za-z0-9_-]+)/", blob.name)
-        if match:
-            feed_urls.add(match.group(1))
+        # Fixed-delimiter parse, so str.partition beats the regex engine here
+        _, sep, rest = blob.name.partition("base64url=")
+        key, slash, _ = rest.partition("/")
+        if sep and slash and key and key not in seen:
+            seen.add(key)
+            yield key
+
+
+def discover_feed_urls(
+    client: storage.Client,
+    bucket_name: str,
+    feed_type: str,
+    date: str,
+) -> set[str]:
+    """Discover all unique base64url feed identifiers for a given date.
+
+    Args:
+        client: GCS client
+        bucket_name: Source bucket name
+        feed_type: Feed type (vehicle_positions, trip_updates, service_alerts)
+        date: Date string in YYYY-MM-DD format
 
-    return feed_urls
+    Returns:
+        Set of base64url-encoded feed URLs found for this date
+    """
+    return set(iter_feed_urls(client, bucket_name, feed_type, date))
 
 
 def list_pb_files(
@@ -125,12 +173,30 @@ def list_pb_files(
     bucket = client.bucket(bucket_name)
     prefix = f"{feed_type}/date={date}/"
 
-    pb_files = []
-    for blob in bucket.list_blobs(prefix=prefix):
-        if f"base64url={feed_url_encoded}/" in blob.name and blob.name.endswith(".pb"):
-            pb_files.append(blob.name)
+    # The glob filters to this feed's .pb files server-side, so the client
+    # only pages through names it will actually return. GCS lists objects
+    # in lexicographic order, so no client-side sort is needed.
+    return [
+        blob.name
+        for blob in bucket.list_blobs(
+            prefix=prefix,
+            match_glob=f"{prefix}**/base64url={feed_url_encoded}/*.pb",
+            fields="items(name),nextPageToken",
+            page_size=1000,
+            retry=DEFAULT_RETRY.with_timeout(60.0),
+        )
+    ]
 
-    return sorted(pb_files)
+
+# Compaction is CPU-bound on protobuf parsing, which is 10x+ slower under the
+# pure-Python fallback than the default upb/cpp extension. Falling back happens
+# silently (e.g. a wheel without the extension), so fail loudly instead.
+if api_implementation.Type() == "python":
+    raise ImportError(
+        "protobuf is using the pure-Python implementation; compaction requires "
+        "the upb/cpp extension (unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION or "
+        "reinstall a protobuf wheel with the native extension)"
+    )
 
 
 def parse_protobuf(content: bytes) -> gtfs_realtime_pb2.FeedMessage:
@@ -163,78 +229,133 @@ def read_meta_file(
         return None
 
 
+def set_fields(message: Any) -> set[str]:
+    """Names of the fields set on a protobuf message.
+
+    One ``ListFields`` reflection pass replaces the 20-40 per-field
+    ``HasField`` round-trips the extractors would otherwise make per entity.
+    """
+    return {fd.name for fd, _ in message.ListFields()}
+
+
+# In-flight downloads per compaction run; each .pb fetch is ~100ms RTT-bound
+DOWNLOAD_PREFETCH = 16
+
+# Rows per parquet row group; one group per .pb file would produce thousands
+# of micro row groups, bloating footer metadata and defeating predicate pushdown
+ROW_GROUP_SIZE = 256_000
+
+
+def iter_file_contents(
+    bucket: storage.Bucket,
+    pb_files: list[str],
+) -> Iterator[tuple[str, bytes, datetime | None]]:
+    """Yield (pb_file, content, fetch_timestamp) for each file, in input order.
+
+    Downloads run on a thread pool with a bounded prefetch window, so wall
+    time no longer stacks one RTT per file while memory stays capped at
+    DOWNLOAD_PREFETCH files.
+    """
+
+    def fetch(pb_file: str) -> tuple[str, bytes, datetime | None]:
+        content = bucket.blob(pb_file).download_as_bytes()
+        return pb_file, content, read_meta_file(bucket, pb_file)
+
+    remaining = iter(pb_files)
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_PREFETCH) as executor:
+        pending: deque[Future[tuple[str, bytes, datetime | None]]] = deque()
+        for pb_file in islice(remaining, DOWNLOAD_PREFETCH):
+            pending.append(executor.submit(fetch, pb_file))
+        while pending:
+            yield pending.popleft().result()
+            next_file = next(remaining, None)
+            if next_file is not None:
+                pending.append(executor.submit(fetch, next_file))
+
+
+def _columns_from_rows(
+    schema: pa.Schema, rows: list[tuple[Any, ...]]
+) -> dict[str, list[Any]]:
+    """Transpose row tuples (in schema field order) into per-column lists."""
+    if not rows:
+        return {name: [] for name in schema.names}
+    return {
+        name: list(column)
+        for name, column in zip(schema.names, zip(*rows, strict=True), strict=True)
+    }
+
+
+# The extractors below stay pure Python by design: wire-format decoding
+# already happens in C via the upb extension (enforced at import above), and
+# the remaining per-entity work is mostly optional strings and sub-messages,
+# which neither Numba nor a Cython kernel can vectorize without first copying
+# everything out through the same Python accessors we call here. They emit
+# struct-of-arrays output (per-column lists) rather than per-row dicts: a row
+# exists only briefly as a tuple in schema field order, and the C-level
+# zip transpose in _columns_from_rows does the rest.
 def extract_vehicle_positions(
     feed: gtfs_realtime_pb2.FeedMessage,
     source_file: str,
     feed_url: str,
     fetch_timestamp: datetime | None,
-) -> Iterator[dict[str, Any]]:
-    """Extract vehicle positions from a FeedMessage."""
+) -> dict[str, list[Any]]:
+    """Extract vehicle positions from a FeedMessage as per-column lists."""
     feed_timestamp = feed.header.timestamp if feed.header.timestamp else None
 
+    rows: list[tuple[Any, ...]] = []
     for entity in feed.entity:
         if entity.HasField("vehicle"):
             vp = entity.vehicle
+            vp_fields = set_fields(vp)
+            has_trip = "trip" in vp_fields
+            has_vehicle = "vehicle" in vp_fields
+            has_position = "position" in vp_fields
+            # Bind sub-messages once; each vp.trip/vp.vehicle/vp.position
+            # attribute access is a Python->C descriptor lookup
+            trip = vp.trip
+            vehicle = vp.vehicle
+            position = vp.position
+            trip_fields = set_fields(trip) if has_trip else set()
+            position_fields = set_fields(position) if has_position else set()
+
+            # VEHICLE_POSITIONS_SCHEMA field order
+            rows.append(
+                (
+                    # Source metadata
+                    source_file,
+                    feed_url,
+                    feed_timestamp,
+                    fetch_timestamp,
+                    entity.id,
+                    # Trip descriptor
+                    trip.trip_id if has_trip else None,
+                    trip.route_id if has_trip else None,
+                    trip.direction_id if "direction_id" in trip_fields else None,
+                    trip.start_time if has_trip else None,
+                    trip.start_date if has_trip else None,
+                    trip.schedule_relationship if has_trip else None,
+                    # Vehicle descriptor
+                    vehicle.id if has_vehicle else None,
+                    vehicle.label if has_vehicle else None,
+                    vehicle.license_plate if has_vehicle else None,
+                    # Position
+                    position.latitude if has_position else None,
+                    position.longitude if has_position else None,
+                    position.bearing if "bearing" in position_fields else None,
+                    position.odometer if "odometer" in position_fields else None,
+                    position.speed if "speed" in position_fields else None,
+                    # Status
+                    vp.current_stop_sequence if "current_stop_sequence" in vp_fields else None,
+                    vp.stop_id if "stop_id" in vp_fields else None,
+                    vp.current_status if "current_status" in vp_fields else None,
+                    vp.timestamp if "timestamp" in vp_fields else None,
+                    vp.congestion_level if "congestion_level" in vp_fields else None,
+                    vp.occupancy_status if "occupancy_status" in vp_fields else None,
+                    vp.occupancy_percentage if "occupancy_percentage" in vp_fields else None,
+                )
+            )
 
-            yield {
-                # Source metadata
-                "source_file": source_file,
-                "feed_url": feed_url,
-                "feed_timestamp": feed_timestamp,
-                "fetch_timestamp": fetch_timestamp,
-                "entity_id": entity.id,
-                # Trip descriptor
-                "trip_id": vp.trip.trip_id if vp.HasField("trip") else None,
-                "route_id": vp.trip.route_id if vp.HasField("trip") else None,
-                "direction_id": (
-                    vp.trip.direction_id
-                    if vp.HasField("trip") and vp.trip.HasField("direction_id")
-                    else None
-                ),
-                "start_time": vp.trip.start_time if vp.HasField("trip") else None,
-                "start_date": vp.trip.start_date if vp.HasField("trip") else None,
-                "schedule_relationship": (
-                    vp.trip.schedule_relationship if vp.HasField("trip") else None
-                ),
-                # Vehicle descriptor
-                "vehicle_id": vp.vehicle.id if vp.HasField("vehicle") else None,
-                "vehicle_label": vp.vehicle.label if vp.HasField("vehicle") else None,
-                "license_plate": vp.vehicle.license_plate if vp.HasField("vehicle") else None,
-                # Position
-                "latitude": vp.position.latitude if vp.HasField("position") else None,
-                "longitude": vp.position.longitude if vp.HasField("position") else None,
-                "bearing": (
-                    vp.position.bearing
-                    if vp.HasField("position") and vp.position.HasField("bearing")
-                    else None
-                ),
-                "odometer": (
-                    vp.position.odometer
-                    if vp.HasField("position") and vp.position.HasField("odometer")
-                    else None
-                ),
-                "speed": (
-                    vp.position.speed
-                    if vp.HasField("position") and vp.position.HasField("speed")
-                    else None
-                ),
-                # Status
-                "current_stop_sequence": (
-                    vp.current_stop_sequence if vp.HasField("current_stop_sequence") else None
-                ),
-                "stop_id": vp.stop_id if vp.HasField("stop_id") else None,
-                "current_status": vp.current_status if vp.HasField("current_status") else None,
-                "timestamp": vp.timestamp if vp.HasField("timestamp") else None,
-                "congestion_level": (
-                    vp.congestion_level if vp.HasField("congestion_level") else None
-                ),
-                "occupancy_status": (
-                    vp.occupancy_status if vp.HasField("occupancy_status") else None
-                ),
-                "occupancy_percentage": (
-                    vp.occupancy_percentage if vp.HasField("occupancy_percentage") else None
-                ),
-            }
+    return _columns_from_rows(VEHICLE_POSITIONS_SCHEMA, rows)
 
 
 def extract_trip_updates(
@@ -242,109 +363,93 @@ def extract_trip_updates(
     source_file: str,
     feed_url: str,
     fetch_timestamp: datetime | None,
-) -> Iterator[dict[str, Any]]:
-    """Extract trip updates from a FeedMessage (denormalized by stop_time_update)."""
+) -> dict[str, list[Any]]:
+    """Extract trip updates from a FeedMessage as per-column lists.
+
+    Denormalized by stop_time_update: one row per stop_time_update, or one
+    base row for trip updates without any.
+    """
     feed_timestamp = feed.header.timestamp if feed.header.timestamp else None
 
+    rows: list[tuple[Any, ...]] = []
     for entity in feed.entity:
         if entity.HasField("trip_update"):
             tu = entity.trip_update
-
-            # Base fields for this trip update
-            base_record = {
+            tu_fields = set_fields(tu)
+            has_trip = "trip" in tu_fields
+            has_vehicle = "vehicle" in tu_fields
+            # Bind sub-messages once; each tu.trip/tu.vehicle attribute
+            # access is a Python->C descriptor lookup
+            trip = tu.trip
+            vehicle = tu.vehicle
+            trip_fields = set_fields(trip) if has_trip else set()
+
+            # Base fields for this trip update (TRIP_UPDATES_SCHEMA order),
+            # built once per entity and shared across its stop_time_updates
+            base = (
                 # Source metadata
-                "source_file": source_file,
-                "feed_url": feed_url,
-                "feed_timestamp": feed_timestamp,
-                "fetch_timestamp": fetch_timestamp,
-                "entity_id": entity.id,
+                source_file,
+                feed_url,
+                feed_timestamp,
+                fetch_timestamp,
+                entity.id,
                 # Trip descriptor
-                "trip_id": tu.trip.trip_id if tu.HasField("trip") else None,
-                "route_id": tu.trip.route_id if tu.HasField("trip") else None,
-                "direction_id": (
-                    tu.trip.direction_id
-                    if tu.HasField("trip") and tu.trip.HasField("direction_id")
-                    else None
-                ),
-                "start_time": tu.trip.start_time if tu.HasField("trip") else None,
-                "start_date": tu.trip.start_date if tu.HasField("trip") else None,
-                "schedule_relationship": (
-                    tu.trip.schedule_relationship if tu.HasField("trip") else None
-                ),
+                trip.trip_id if has_trip else None,
+                trip.route_id if has_trip else None,
+                trip.direction_id if "direction_id" in trip_fields else None,
+                trip.start_time if has_trip else None,
+                trip.start_date if has_trip else None,
+                trip.schedule_relationship if has_trip else None,
                 # Vehicle descriptor
-                "vehicle_id": tu.vehicle.id if tu.HasField("vehicle") else None,
-                "vehicle_label": tu.vehicle.label if tu.HasField("vehicle") else None,
+                vehicle.id if has_vehicle else None,
+                vehicle.label if has_vehicle else None,
                 # Trip-level fields
-                "trip_timestamp": tu.timestamp if tu.HasField("timestamp") else None,
-                "trip_delay": tu.delay if tu.HasField("delay") else None,
-            }
+                tu.timestamp if "timestamp" in tu_fields else None,
+                tu.delay if "delay" in tu_fields else None,
+            )
 
             # Denormalize: one row per stop_time_update
             if tu.stop_time_update:
                 for stu in tu.stop_time_update:
-                    record = base_record.copy()
-                    record.update(
-                        {
-                            "stop_sequence": (
-                                stu.stop_sequence if stu.HasField("stop_sequence") else None
-                            ),
-                            "stop_id": stu.stop_id if stu.HasField("stop_id") else None,
-                            "arrival_delay": (
-                                stu.arrival.delay
-                                if stu.HasField("arrival") and stu.arrival.HasField("delay")
-                                else None
-                            ),
-                            "arrival_time": (
-                                stu.arrival.time
-                                if stu.HasField("arrival") and stu.arrival.HasField("time")
-                                else None
-                            ),
-                            "arrival_uncertainty": (
-                                stu.arrival.uncertainty
-                                if stu.HasField("arrival") and stu.arrival.HasField("uncertainty")
-                                else None
-                            ),
-                            "departure_delay": (
-                                stu.departure.delay
-                                if stu.HasField("departure") and stu.departure.HasField("delay")
-                                else None
-                            ),
-                            "departure_time": (
-                                stu.departure.time
-                                if stu.HasField("departure") and stu.departure.HasField("time")
-                                else None
-                            ),
-                            "departure_uncertainty": (
-                                stu.departure.uncertainty
-                                if stu.HasField("departure")
-                                and stu.departure.HasField("uncertainty")
-                                else None
-                            ),
-                            "stop_schedule_relationship": (
-                                stu.schedule_relationship
-                                if stu.HasField("schedule_relationship")
-                                else None
-                            ),
-                        }
+                    stu_fields = set_fields(stu)
+                    # Bind the composite sub-messages once per stop_time_update;
+                    # each stu.arrival/stu.departure attribute access goes
+                    # through the message's composite-field container
+                    arrival = stu.arrival
+                    departure = stu.departure
+                    arrival_fields = set_fields(arrival) if "arrival" in stu_fields else set()
+                    departure_fields = (
+                        set_fields(departure) if "departure" in stu_fields else set()
+                    )
+
+                    rows.append(
+                        base
+                        + (
+                            stu.stop_sequence if "stop_sequence" in stu_fields else None,
+                            stu.stop_id if "stop_id" in stu_fields else None,
+                            arrival.delay if "delay" in arrival_fields else None,
+                            arrival.time if "time" in arrival_fields else None,
+                            arrival.uncertainty if "uncertainty" in arrival_fields else None,
+                            departure.delay if "delay" in departure_fields else None,
+                            departure.time if "time" in departure_fields else None,
+                            departure.uncertainty if "uncertainty" in departure_fields else None,
+                            stu.schedule_relationship
+                            if "schedule_relationship" in stu_fields
+                            else None,
+                        )
                     )
-                    yield record
             else:
-                # Trip update with no stop time updates - still yield the base record
-                record = base_record.copy()
-                record.update(
-                    {
-                        "stop_sequence": None,
-                        "stop_id": None,
-                        "arrival_delay": None,
-                        "arrival_time": None,
-                        "arrival_uncertainty": None,
-                        "departure_delay": None,
-                        "departure_time": None,
-                        "departure_uncertainty": None,
-                        "stop_schedule_relationship": None,
-                    }
-                )
-                yield record
+                # Trip update with no stop time updates - still emit the base row
+                rows.append(base + (None,) * 9)
+
+    return _columns_from_rows(TRIP_UPDATES_SCHEMA, rows)
+
+
+def first_translation_text(translated_string: Any) -> str | None:
+    """Return the first translation's text (typically English), if any."""
+    if translated_string and translated_string.translation:
+        return str(translated_string.translation[0].text)
+    return None
 
 
 def extract_service_alerts(
@@ -352,92 +457,226 @@ def extract_service_alerts(
     source_file: str,
     feed_url: str,
     fetch_timestamp: datetime | None,
-) -> Iterator[dict[str, Any]]:
-    """Extract service alerts from a FeedMessage (denormalized by informed_entity)."""
+) -> dict[str, list[Any]]:
+    """Extract service alerts from a FeedMessage as per-column lists.
+
+    Denormalized by informed_entity: one row per informed_entity, or one
+    base row for alerts without any.
+    """
     feed_timestamp = feed.header.timestamp if feed.header.timestamp else None
 
+    rows: list[tuple[Any, ...]] = []
     for entity in feed.entity:
         if entity.HasField("alert"):
             alert = entity.alert
+            alert_fields = set_fields(alert)
 
             # Get first active period if available
             active_start = None
             active_end = None
             if alert.active_period:
                 ap = alert.active_period[0]
-                active_start = ap.start if ap.HasField("start") else None
-                active_end = ap.end if ap.HasField("end") else None
-
-            # Get first translation for text fields (typically English)
-            def get_text(translated_string: Any) -> str | None:
-                if translated_string and translated_string.translation:
-                    return str(translated_string.translation[0].text)
-                return None
-
-            header_text = get_text(alert.header_text) if alert.HasField("header_text") else None
+                ap_fields = set_fields(ap)
+                active_start = ap.start if "start" in ap_fields else None
+                active_end = ap.end if "end" in ap_fields else None
+
+            header_text = (
+                first_translation_text(alert.header_text)
+                if "header_text" in alert_fields
+                else None
+            )
             description_text = (
-                get_text(alert.description_text) if alert.HasField("description_text") else None
+                first_translation_text(alert.description_text)
+                if "description_text" in alert_fields
+                else None
             )
-            url = get_text(alert.url) if alert.HasField("url") else None
+            url = first_translation_text(alert.url) if "url" in alert_fields else None
 
-            # Base fields for this alert
-            base_record = {
+            # Base fields for this alert (SERVICE_ALERTS_SCHEMA order),
+            # built once per entity and shared across its informed_entities
+            base = (
                 # Source metadata
-                "source_file": source_file,
-                "feed_url": feed_url,
-                "feed_timestamp": feed_timestamp,
-                "fetch_timestamp": fetch_timestamp,
-                "entity_id": entity.id,
+                source_file,
+                feed_url,
+                feed_timestamp,
+                fetch_timestamp,
+                entity.id,
                 # Alert fields
-                "cause": alert.cause if alert.HasField("cause") else None,
-                "effect": alert.effect if alert.HasField("effect") else None,
-                "severity_level": (
-                    alert.severity_level if alert.HasField("severity_level") else None
-                ),
+                alert.cause if "cause" in alert_fields else None,
+                alert.effect if "effect" in alert_fields else None,
+                alert.severity_level if "severity_level" in alert_fields else None,
                 # Active period
-                "active_period_start": active_start,
-                "active_period_end": active_end,
+                active_start,
+                active_end,
                 # Text fields
-                "header_text": header_text,
-                "description_text": description_text,
-                "url": url,
-            }
+                header_text,
+                description_text,
+                url,
+            )
 
             # Denormalize: one row per informed_entity
             if alert.informed_entity:
                 for ie in alert.informed_entity:
-                    record = base_record.copy()
-                    record.update(
-                        {
-                            "agency_id": ie.agency_id if ie.HasField("agency_id") else None,
-                            "route_id": ie.route_id if ie.HasField("route_id") else None,
-                            "route_type": ie.route_type if ie.HasField("route_type") else None,
-                            "stop_id": ie.stop_id if ie.HasField("stop_id") else None,
-                            "trip_id": ie.trip.trip_id if ie.HasField("trip") else None,
-                            "trip_route_id": ie.trip.route_id if ie.HasField("trip") else None,
-                            "trip_direction_id": (
-                                ie.trip.direction_id
-                                if ie.HasField("trip") and ie.trip.HasField("direction_id")
-                                else None
-                            ),
-                        }
+                    ie_fields = set_fields(ie)
+                    has_trip = "trip" in ie_fields
+                    trip = ie.trip
+                    trip_fields = set_fields(trip) if has_trip else set()
+
+                    rows.append(
+                        base
+                        + (
+                            ie.agency_id if "agency_id" in ie_fields else None,
+                            ie.route_id if "route_id" in ie_fields else None,
+                            ie.route_type if "route_type" in ie_fields else None,
+                            ie.stop_id if "stop_id" in ie_fields else None,
+                            trip.trip_id if has_trip else None,
+                            trip.route_id if has_trip else None,
+                            trip.direction_id if "direction_id" in trip_fields else None,
+                        )
                     )
-                    yield record
             else:
-                # Alert with no informed entities - still yield the base record
-                record = base_record.copy()
-                record.update(
-                    {
-                        "agency_id": None,
-                        "route_id": None,
-                        "route_type": None,
-                        "stop_id": None,
-                        "trip_id": None,
-                        "trip_route_id": None,
-                        "trip_direction_id": None,
-                    }
-                )
-                yield record
+                # Alert with no informed entities - still emit the base row
+                rows.append(base + (None,) * 7)
+
+    return _columns_from_rows(SERVICE_ALERTS_SCHEMA, rows)
+
+
+class ColumnBuilder:
+    """Accumulates records column-wise for Arrow batch construction.
+
+    Appending into per-column lists and building each array with its schema
+    type skips the per-row dict probing and type inference that
+    ``pa.Table.from_pylist`` does.
+    """
+
+    def __init__(self, schema: pa.Schema) -> None:
+        self.schema = schema
+        self.columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+        self.num_rows = 0
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Append one record's values onto the column lists."""
+        for name, values in self.columns.items():
+            values.append(record[name])
+        self.num_rows += 1
+
+    def extend(self, columns: dict[str, list[Any]]) -> None:
+        """Append another set of per-column lists (an extractor's SoA output)."""
+        added = len(columns[self.schema.names[0]])
+        for name, values in self.columns.items():
+            values.extend(columns[name])
+        self.num_rows += added
+
+    def finish(self) -> pa.RecordBatch:
+        """Build a RecordBatch from the accumulated columns and reset.
+
+        Resets even when conversion fails, so one bad value discards its own
+        batch instead of poisoning every later batch built through this
+        instance.
+        """
+        try:
+            return pa.record_batch(
+                [pa.array(self.columns[field.name], type=field.type) for field in self.schema],
+                schema=self.schema,
+            )
+        finally:
+            self.columns = {name: [] for name in self.schema.names}
+            self.num_rows = 0
+
+
+# Extraction subprocesses per compaction run; protobuf decode and record
+# assembly are CPU-bound, so size to the machine
+COMPACTION_PROCESSES = os.cpu_count() or 4
+
+# Rows buffered as Python objects in a subprocess before spilling to a
+# compact Arrow batch
+EXTRACT_BATCH_ROWS = 16_384
+
+# Extraction slices per subprocess; finer-than-per-worker slicing keeps each
+# completed result small, so the bounded submission window in
+# compact_single_feed caps how much uncompressed IPC output can pile up
+# between workers finishing and the parent draining
+EXTRACT_SLICES_PER_PROCESS = 4
+
+
+@lru_cache(maxsize=1)
+def _worker_client() -> storage.Client:
+    """Per-subprocess GCS client (clients do not survive fork/pickle).
+
+    Pool sized for the DOWNLOAD_PREFETCH threads in iter_file_contents; a
+    stock client's 10-connection default pool churns connections under the
+    16-way prefetch.
+    """
+    return build_pooled_client(None, DOWNLOAD_PREFETCH)
+
+
+def _extract_chunk(
+    bucket_name: str,
+    pb_files: list[str],
+    feed_url: str,
+    extractor_name: str,
+    schema: pa.Schema,
+) -> tuple[list[tuple[str, str]], bytes | None]:
+    """Download, parse and columnarize one slice of .pb files (subprocess entry).
+
+    The extractor is passed by name so only picklable primitives cross the
+    process boundary; the batch itself crosses as Arrow IPC stream bytes,
+    which the parent re-opens zero-copy instead of unpickling row data.
+
+    Returns:
+        Tuple of (files skipped with their errors, IPC bytes or None)
+    """
+    bucket = _worker_client().bucket(bucket_name)
+    extractor = globals()[extractor_name]
+    builder = ColumnBuilder(schema)
+    failed: list[tuple[str, str]] = []
+    total_rows = 0
+
+    # One message reused across files: Clear() + ParseFromString recycles the
+    # upb arena instead of reallocating a FeedMessage per .pb file. Safe
+    # because the extractors copy every value out before the next parse.
+    feed = gtfs_realtime_pb2.FeedMessage()
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as ipc:
+        # Files whose rows sit in the builder awaiting the next spill; a
+        # conversion failure drops and reports exactly this set
+        batch_files: list[str] = []
+
+        def spill() -> None:
+            nonlocal total_rows
+            batch_rows = builder.num_rows
+            try:
+                ipc.write_batch(builder.finish())
+            except (ValueError, OverflowError) as e:
+                failed.extend((batch_file, str(e)) for batch_file in batch_files)
+            else:
+                total_rows += batch_rows
+            batch_files.clear()
+
+        for pb_file, content, fetch_timestamp in iter_file_contents(bucket, pb_files):
+            try:
+                feed.Clear()
+                feed.ParseFromString(content)
+                # Accumulate each file's columns and spill to compact Arrow
+                # batches periodically, so the per-value Python objects never
+                # accumulate far beyond EXTRACT_BATCH_ROWS
+                builder.extend(extractor(feed, pb_file, feed_url, fetch_timestamp))
+                batch_files.append(pb_file)
+            except (DecodeError, ValueError) as e:
+                failed.append((pb_file, str(e)))
+                continue
+            # Spill outside the per-file exception scope: the builder holds
+            # rows from every file since the last spill, so a conversion
+            # error must not be pinned on whichever file triggered the flush
+            if builder.num_rows >= EXTRACT_BATCH_ROWS:
+                spill()
+        if builder.num_rows:
+            spill()
+
+    if not total_rows:
+        return failed, None
+    return failed, sink.getvalue().to_pybytes()
 
 
 def compact_single_feed(
@@ -449,6 +688,11 @@ def compact_single_feed(
 ) -> dg.Output[dict[str, int]]:
     """Compact a single feed for a single date partition.
 
+    The three per-type assets share this helper but never touch the same
+    bytes: the archiver writes each feed under its own {feed_type}/ prefix,
+    so each asset downloads and parses a disjoint set of .pb blobs. Fusing
+    them into one pass would not save any network or parse work.
+
     Args:
         context: Dagster asset execution context with MultiPartitionKey
         gcs: GCS resource
@@ -490,43 +734,108 @@ def compact_single_feed(
 
     context.log.info(f"Processing {len(pb_files)} files for feed {feed_key}")
 
-    # Stream records to parquet using batched writes to reduce memory usage
-    protobuf_bucket = client.bucket(gcs.protobuf_bucket)
-    parquet_bucket = client.bucket(gcs.parquet_bucket)
+    # Fan extraction out across subprocesses: protobuf decode and record
+    # assembly are CPU-bound and serialize on the GIL under threads, so each
+    # subprocess downloads, parses and columnarizes its own slice of files.
+    # Slices are finer than one per worker and flow through a bounded
+    # submission window below, so peak memory is the window's worth of
+    # uncompressed IPC results plus one row group in the parent - not the
+    # whole dataset parked in completed futures while the parent drains.
+    # The output stream is committed only on success; a failed run discards
+    # its in-progress upload so no truncated object lands at the path.
+    chunk_size = -(-len(pb_files) // (COMPACTION_PROCESSES * EXTRACT_SLICES_PER_PROCESS))
+    slices = [pb_files[i : i + chunk_size] for i in range(0, len(pb_files), chunk_size)]
+
+    fs = gcs.get_filesystem()
 
     output_path = f"{feed_type}/date={date}/base64url={feed_url_encoded}/data.parquet"
-    buffer = io.BytesIO()
+    out: Any = None
     writer: pq.ParquetWriter | None = None
+    pending: list[pa.RecordBatch] = []
+    pending_rows = 0
     records_count = 0
 
     try:
-        for pb_file in pb_files:
-            blob = protobuf_bucket.blob(pb_file)
-            content = blob.download_as_bytes()
-
-            # Read fetch_timestamp from adjacent .meta file
-            fetch_timestamp = read_meta_file(protobuf_bucket, pb_file)
+        with ProcessPoolExecutor(max_workers=COMPACTION_PROCESSES) as pool:
+
+            def submit(file_slice: list[str]) -> Future[tuple[list[tuple[str, str]], bytes | None]]:
+                return pool.submit(
+                    _extract_chunk,
+                    gcs.protobuf_bucket,
+                    file_slice,
+                    feed_url,
+                    extractor.__name__,
+                    schema,
+                )
 
-            try:
-                feed = parse_protobuf(content)
-                records = list(extractor(feed, pb_file, feed_url, fetch_timestamp))
-                if not records:
+            # Keep enough slices in flight to feed every worker plus a small
+            # completion buffer; consume in submission order so output row
+            # order stays deterministic across runs
+            remaining = iter(slices)
+            window: deque[Future[tuple[list[tuple[str, str]], bytes | None]]] = deque(
+                submit(file_slice) for file_slice in islice(remaining, COMPACTION_PROCESSES + 2)
+            )
+            while window:
+                failed, ipc_bytes = window.popleft().result()
+                next_slice = next(remaining, None)
+                if next_slice is not None:
+                    window.append(submit(next_slice))
+                for pb_file, error in failed:
+                    context.log.warning(f"Failed to parse {pb_file}: {error}")
+                if ipc_bytes is None:
                     continue
 
-                # Write batch to parquet stream
-                batch = pa.Table.from_pylist(records, schema=schema)
                 if writer is None:
+                    out = fs.open(f"{gcs.parquet_bucket}/{output_path}", "wb")
                     writer = pq.ParquetWriter(
-                        buffer, schema, compression="zstd", compression_level=9
+                        out,
+                        schema,
+                        # Level 3 writes several times faster than level 9
+                        # for only a few percent larger output on this data
+                        compression="zstd",
+                        compression_level=3,
+                        # Dictionary-encode only the columns that repeat per
+                        # row; blanket encoding wastes effort on near-unique
+                        # numeric columns
+                        use_dictionary=["source_file", "feed_url"],
+                        # Stats only on the columns queries actually filter
+                        # by; computing min/max for every column is wasted CPU
+                        write_statistics=["feed_timestamp", "route_id", "stop_id"],
+                        data_page_size=1 << 20,
                     )
-                writer.write_table(batch)
-                records_count += len(records)
-            except (DecodeError, ValueError) as e:
-                context.log.warning(f"Failed to parse {pb_file}: {e}")
-                continue
-    finally:
+
+                # Accumulate across chunks and flush at row-group
+                # boundaries, rather than one micro row group per chunk
+                for batch in pa.ipc.open_stream(pa.BufferReader(ipc_bytes)):
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    records_count += batch.num_rows
+                    if pending_rows >= ROW_GROUP_SIZE:
+                        writer.write_table(
+                            pa.Table.from_batches(pending), row_group_size=ROW_GROUP_SIZE
+                        )
+                        pending = []
+                        pending_rows = 0
+
+        # Flush the partial final row group
+        if writer is not None and pending:
+            writer.write_table(pa.Table.from_batches(pending), row_group_size=ROW_GROUP_SIZE)
+
+        # Closing the writer finalizes the parquet footer and closing the
+        # stream commits the GCS object, so both happen only on success. A
+        # truncated file would still carry a valid footer, and committing it
+        # on failure would silently undercount rows in the inventory until
+        # the next rerun.
         if writer is not None:
             writer.close()
+        if out is not None:
+            out.close()
+    except BaseException:
+        # Abandon the in-progress upload instead of committing a partial
+        # object; GCS only creates the object when the stream is finalized.
+        if out is not None:
+            out.discard()
+        raise
 
     if writer is None:
         context.log.info(f"No records extracted for feed {feed_key}")
@@ -541,11 +850,11 @@ def compact_single_feed(
             },
         )
 
-    # Upload parquet file
-    buffer.seek(0)
-
-    output_blob = parquet_bucket.blob(output_path)
-    output_blob.upload_from_file(buffer, content_type="application/octet-stream")
+    # Stamp the row count onto the object so bucket_inventory can pick it up
+    # straight from its listing instead of re-reading the parquet footer.
+    output_blob = client.bucket(gcs.parquet_bucket).blob(output_path)
+    output_blob.metadata = {"row_count": str(records_count)}
+    output_blob.patch()
 
     context.log.info(f"Wrote {records_count} records to gs://{gcs.parquet_bucket}/{output_path}")
 
@@ -82,7 +82,8 @@ def feeds_metadata(
     # Write to Parquet buffer
     table = pa.Table.from_pylist(records, schema=FEEDS_SCHEMA)
     buffer = io.BytesIO()
-    pq.write_table(table, buffer, compression="zstd", compression_level=9)
+    # zstd's default level; 9 was pure wasted CPU on a file this small
+    pq.write_table(table, buffer, compression="zstd", compression_level=3)
     buffer.seek(0)
 
     # Upload to GCS
@@ -1,129 +1,271 @@
 """Bucket inventory asset for discovering parquet files and generating inventory.json."""
 
-import io
+import gzip
 import json
-import re
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NotRequired, TypedDict
 
 import dagster as dg
 import gcsfs  # type: ignore[import-untyped]
+import pyarrow as pa
 import pyarrow.parquet as pq
 from google.cloud import storage
 
 from dagster_pipeline.defs.resources import GCSResource
+from gtfs_rt_archiver.models import FeedType
+
+# One range read of this many trailing bytes almost always covers the whole
+# parquet footer (thrift metadata + length word + magic); only unusually wide
+# footers need a second, exactly-sized read.
+FOOTER_PREFETCH_BYTES = 64 * 1024
+
+# Sidecar cache of per-file row counts keyed by path. Compacted parquet
+# files are immutable once written (rewrites bump the blob generation), so
+# successive inventory runs only footer-read new or regenerated files.
+INVENTORY_CACHE_PATH = "inventory_cache.json"
+
+
+class RtParquetFile(TypedDict):
+    """One compacted data.parquet blob as parsed from the bucket listing."""
+
+    path: str
+    feed_type: str
+    date: str
+    base64url: str
+    size_bytes: int
+    generation: int
+    # Known up front only when stamped as object metadata by compaction
+    row_count: NotRequired[int]
 
 
 class BucketScanResult:
     """Results from scanning the parquet bucket in a single pass."""
 
     def __init__(self) -> None:
-        self.rt_parquet_files: list[dict[str, Any]] = []
+        self.rt_parquet_files: list[RtParquetFile] = []
         self.schedule_metadata: list[dict[str, str]] = []  # [{path, base64url, feed_digest}]
 
 
-# RT pattern: {feed_type}/date={YYYY-MM-DD}/base64url={encoded}/data.parquet
-_RT_PATTERN = re.compile(
-    r"^(?P<feed_type>[^/]+)/date=(?P<date>\d{4}-\d{2}-\d{2})/base64url=(?P<base64url>[A-Za-z0-9_-]+)/data\.parquet$"
-)
+# Blob paths have a rigid four-segment layout, so a split plus prefix checks
+# parses them several times faster than the regexes they replace — this runs
+# once per blob in the bucket.
 
-# Schedule pattern: schedules/base64url={encoded}/_feed_digest={hash}/metadata.json
-_SCHEDULE_PATTERN = re.compile(
-    r"^schedules/base64url=(?P<base64url>[A-Za-z0-9_-]+)/_feed_digest=(?P<feed_digest>[^/]+)/metadata\.json$"
-)
 
+def _parse_rt_path(name: str) -> tuple[str, str, str] | None:
+    """Parse ``{feed_type}/date={YYYY-MM-DD}/base64url={encoded}/data.parquet``.
 
-def scan_bucket(
+    Returns (feed_type, date, base64url), or None if the path doesn't match.
+    """
+    parts = name.split("/")
+    if len(parts) != 4 or parts[3] != "data.parquet":
+        return None
+    feed_type, date_part, b64_part = parts[0], parts[1], parts[2]
+    if not (date_part.startswith("date=") and b64_part.startswith("base64url=")):
+        return None
+    date = date_part[5:]
+    base64url = b64_part[10:]
+    if len(date) != 10 or not base64url:
+        return None
+    return feed_type, date, base64url
+
+
+def _parse_schedule_path(name: str) -> tuple[str, str] | None:
+    """Parse ``schedules/base64url={encoded}/_feed_digest={hash}/metadata.json``.
+
+    Returns (base64url, feed_digest), or None if the path doesn't match.
+    """
+    parts = name.split("/")
+    if len(parts) != 4 or parts[0] != "schedules" or parts[3] != "metadata.json":
+        return None
+    b64_part, digest_part = parts[1], parts[2]
+    if not (b64_part.startswith("base64url=") and digest_part.startswith("_feed_digest=")):
+        return None
+    base64url = b64_part[10:]
+    feed_digest = digest_part[13:]
+    if not base64url or not feed_digest:
+        return None
+    return base64url, feed_digest
+
+
+def _scan_rt_prefix(
     client: storage.Client,
     bucket_name: str,
-) -> BucketScanResult:
-    """Single-pass scan of the parquet bucket for RT data files and schedule metadata."""
+    prefix: str,
+) -> list[RtParquetFile]:
+    """List one feed-type prefix and parse its data.parquet blob paths."""
     bucket = client.bucket(bucket_name)
-    result = BucketScanResult()
+    files: list[RtParquetFile] = []
+    # match_glob filters to data files server-side; the fields mask drops
+    # per-blob metadata we never read (hashes, ACLs, timestamps).
+    blobs = bucket.list_blobs(
+        prefix=prefix,
+        match_glob=f"{prefix}**/data.parquet",
+        fields="items(name,size,generation,metadata),nextPageToken",
+    )
+    for blob in blobs:
+        name = blob.name
+        parsed = _parse_rt_path(name)
+        if parsed:
+            feed_type, date, base64url = parsed
+            record: RtParquetFile = {
+                "path": name,
+                "feed_type": feed_type,
+                "date": date,
+                "base64url": base64url,
+                "size_bytes": blob.size or 0,
+                "generation": blob.generation or 0,
+            }
+            # Compaction stamps the row count onto the object; files written
+            # before that (or by other tooling) fall back to a footer read.
+            row_count = (blob.metadata or {}).get("row_count")
+            if row_count is not None and row_count.isdigit():
+                record["row_count"] = int(row_count)
+            files.append(record)
+    return files
+
 
-    for blob in bucket.list_blobs():
+def _scan_schedules(
+    client: storage.Client,
+    bucket_name: str,
+) -> list[dict[str, str]]:
+    """List the schedules/ prefix and parse metadata.json blob paths."""
+    bucket = client.bucket(bucket_name)
+    entries: list[dict[str, str]] = []
+    blobs = bucket.list_blobs(
+        prefix="schedules/",
+        match_glob="schedules/**/metadata.json",
+        fields="items(name),nextPageToken",
+    )
+    for blob in blobs:
         name = blob.name
+        parsed = _parse_schedule_path(name)
+        if parsed:
+            base64url, feed_digest = parsed
+            entries.append(
+                {
+                    "path": name,
+                    "base64url": base64url,
+                    "feed_digest": feed_digest,
+                }
+            )
+    return entries
+
+
+def scan_bucket(
+    client: storage.Client,
+    bucket_name: str,
+) -> BucketScanResult:
+    """Scan the parquet bucket for RT data files and schedule metadata.
+
+    The bucket layout confines each object family to a known top-level
+    prefix (one per feed type, plus ``schedules/``), so the four paginated
+    listings run concurrently instead of as one serial walk. List pages
+    arrive at 1000 objects per round trip, making pagination latency the
+    dominant cost on large buckets.
+    """
+    result = BucketScanResult()
 
-        if name.endswith("data.parquet"):
-            match = _RT_PATTERN.match(name)
-            if match:
-                result.rt_parquet_files.append(
-                    {
-                        "path": name,
-                        "feed_type": match.group("feed_type"),
-                        "date": match.group("date"),
-                        "base64url": match.group("base64url"),
-                        "size_bytes": blob.size or 0,
-                    }
-                )
-        elif name.endswith("metadata.json") and name.startswith("schedules/"):
-            match = _SCHEDULE_PATTERN.match(name)
-            if match:
-                result.schedule_metadata.append(
-                    {
-                        "path": name,
-                        "base64url": match.group("base64url"),
-                        "feed_digest": match.group("feed_digest"),
-                    }
-                )
+    with ThreadPoolExecutor(max_workers=len(FeedType) + 1) as executor:
+        rt_futures = [
+            executor.submit(_scan_rt_prefix, client, bucket_name, f"{feed_type.value}/")
+            for feed_type in FeedType
+        ]
+        schedules_future = executor.submit(_scan_schedules, client, bucket_name)
+        for future in rt_futures:
+            result.rt_parquet_files.extend(future.result())
+        result.schedule_metadata = schedules_future.result()
 
     return result
 
 
-def read_parquet_row_count(
+def _row_count_from_tail(
     fs: gcsfs.GCSFileSystem,
-    bucket_name: str,
-    path: str,
+    gcs_path: str,
+    file_size: int,
+    tail: bytes,
 ) -> int:
-    """Read row count from parquet file metadata using efficient range reads.
+    """Parse a row count from a prefetched parquet tail buffer."""
+    if tail[-4:] != b"PAR1":
+        raise ValueError(f"Not a parquet file: gs://{gcs_path}")
+    footer_length = int.from_bytes(tail[-8:-4], "little") + 8
+    if footer_length > len(tail):
+        # Footer wider than the prefetch window; re-read it exactly.
+        tail = fs.cat_file(gcs_path, start=file_size - footer_length, end=file_size)
+    metadata = pq.read_metadata(pa.BufferReader(tail))
+    return int(metadata.num_rows)
+
 
-    Uses gcsfs to read only the parquet footer (~8KB) instead of the entire file.
+def read_row_counts(
+    fs: gcsfs.GCSFileSystem,
+    bucket_name: str,
+    parquet_files: list[RtParquetFile],
+) -> list[int]:
+    """Read row counts for all parquet files, ordered like the input.
+
+    A single ``cat_ranges`` call pipelines one footer prefetch per file over
+    gcsfs's shared aiohttp session, so the whole batch costs a handful of
+    round trips regardless of file count. Each prefetch grabs the last 64KB,
+    which covers the footer length word and the footer itself for typical
+    files; file sizes come from the bucket listing, so no stat calls either.
     """
-    gcs_path = f"{bucket_name}/{path}"
-    metadata = pq.read_metadata(gcs_path, filesystem=fs)
-    return int(metadata.num_rows)
+    paths = [f"{bucket_name}/{pf['path']}" for pf in parquet_files]
+    sizes = [pf["size_bytes"] for pf in parquet_files]
+    starts = [max(0, size - FOOTER_PREFETCH_BYTES) for size in sizes]
+    tails = fs.cat_ranges(paths, starts, sizes, on_error="raise")
+    return [
+        _row_count_from_tail(fs, path, size, tail)
+        for path, size, tail in zip(paths, sizes, tails, strict=True)
+    ]
 
 
-def load_feeds_metadata(
+def _load_row_count_cache(
     client: storage.Client,
     bucket_name: str,
+) -> dict[str, dict[str, int]]:
+    """Load the row-count cache sidecar, or an empty dict if absent/corrupt."""
+    blob = client.bucket(bucket_name).blob(INVENTORY_CACHE_PATH)
+    if not blob.exists():
+        return {}
+    try:
+        cache = json.loads(blob.download_as_text())
+    except ValueError:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def load_feeds_metadata(
+    fs: gcsfs.GCSFileSystem,
+    bucket_name: str,
 ) -> dict[str, dict[str, str | None]]:
     """Load feeds.parquet and return lookup by base64url.
 
+    Reads through gcsfs with column projection, so pyarrow fetches only the
+    footer plus the selected column chunks instead of buffering the whole
+    file before parsing.
+
     Returns dict mapping base64url -> {agency_id, agency_name, system_id, system_name, feed_type}
     """
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob("feeds.parquet")
-
-    if not blob.exists():
+    columns = [
+        "base64url",
+        "url",
+        "agency_id",
+        "agency_name",
+        "system_id",
+        "system_name",
+        "feed_type",
+    ]
+    try:
+        table = pq.read_table(f"{bucket_name}/feeds.parquet", filesystem=fs, columns=columns)
+    except FileNotFoundError:
         return {}
-
-    buffer = io.BytesIO()
-    blob.download_to_file(buffer)
-    buffer.seek(0)
-
-    table = pq.read_table(
-        buffer,
-        columns=[
-            "base64url",
-            "url",
-            "agency_id",
-            "agency_name",
-            "system_id",
-            "system_name",
-            "feed_type",
-        ],
-    )
-    feeds: dict[str, dict[str, str | None]] = {}
-    for row in table.to_pylist():
-        feeds[row["base64url"]] = {
-            "url": row["url"],
-            "agency_id": row["agency_id"],
-            "agency_name": row["agency_name"],
-            "system_id": row["system_id"],
-            "system_name": row["system_name"],
-            "feed_type": row["feed_type"],
-        }
-    return feeds
+    # Convert each column to Python once (contiguous) rather than building a
+    # throwaway dict per row with to_pylist.
+    base64urls, *value_columns = (table.column(name).to_pylist() for name in columns)
+    value_keys = columns[1:]
+    return {
+        base64url: dict(zip(value_keys, values, strict=True))
+        for base64url, *values in zip(base64urls, *value_columns, strict=True)
+    }
 
 
 @dg.asset(
@@ -142,11 +284,11 @@ def bucket_inventory(
     aggregates per feed URL, and writes inventory.json to bucket root.
     """
     client = gcs.get_client()
-    fs = gcsfs.GCSFileSystem(project=gcs.project_id)
+    fs = gcs.get_filesystem()
 
     # Step 1: Load feeds metadata for agency info lookup
     context.log.info("Loading feeds metadata from feeds.parquet")
-    feeds_lookup = load_feeds_metadata(client, gcs.parquet_bucket)
+    feeds_lookup = load_feeds_metadata(fs, gcs.parquet_bucket)
     context.log.info(f"Loaded metadata for {len(feeds_lookup)} feeds")
 
     # Step 2: Single-pass bucket scan for RT parquet + schedule metadata
@@ -167,72 +309,115 @@ def bucket_inventory(
             metadata={"feeds_count": 0, "files_processed": 0},
         )
 
-    # Step 3: Read row counts for each file (uses range reads for efficiency)
-    context.log.info("Reading parquet metadata for row counts")
-    for i, pf in enumerate(parquet_files):
-        if (i + 1) % 50 == 0:
-            context.log.info(f"Progress: {i + 1}/{len(parquet_files)} files")
-        path = str(pf["path"])
-        pf["row_count"] = read_parquet_row_count(fs, gcs.parquet_bucket, path)
-
-    # Step 4: Aggregate per feed (by base64url)
-    # Group by base64url across all feed types
-    feed_aggregates: dict[str, dict[str, Any]] = {}
-
+    # Step 3: Read row counts for each file (uses range reads for efficiency).
+    # Counts stamped on the object by compaction arrive with the listing;
+    # counts from prior runs are reused when the blob generation is
+    # unchanged; only files with neither pay a footer read.
+    cache = _load_row_count_cache(client, gcs.parquet_bucket)
+    to_read: list[RtParquetFile] = []
     for pf in parquet_files:
-        base64url = str(pf["base64url"])
-
-        if base64url not in feed_aggregates:
-            # Look up URL and agency info from feeds metadata
-            feed_meta = feeds_lookup.get(base64url, {})
-            feed_aggregates[base64url] = {
-                "base64url": base64url,
-                "agency_id": feed_meta.get("agency_id"),
-                "agency_name": feed_meta.get("agency_name"),
-                "system_id": feed_meta.get("system_id"),
-                "system_name": feed_meta.get("system_name"),
-                "feed_type": feed_meta.get("feed_type"),
-                "dates": set(),
-                "total_records": 0,
-                "total_bytes": 0,
-            }
-
-        agg = feed_aggregates[base64url]
-        agg["dates"].add(pf["date"])
-        agg["total_records"] += pf["row_count"]
-        agg["total_bytes"] += pf["size_bytes"]
-
-    # Step 5: Build feeds array
-    feeds_output: list[dict[str, Any]] = []
-    total_records = 0
-    total_bytes = 0
-
-    for base64url, agg in feed_aggregates.items():
-        feed_meta = feeds_lookup.get(base64url, {})
-        url = feed_meta.get("url")
+        if "row_count" in pf:
+            continue
+        cached = cache.get(pf["path"])
+        if cached is not None and cached.get("generation") == pf["generation"]:
+            pf["row_count"] = cached["row_count"]
+        else:
+            to_read.append(pf)
+    context.log.info(
+        f"Reading parquet metadata for {len(to_read)} files "
+        f"({len(parquet_files) - len(to_read)} cached)"
+    )
+    row_counts = read_row_counts(fs, gcs.parquet_bucket, to_read)
+    for pf, row_count in zip(to_read, row_counts, strict=True):
+        pf["row_count"] = row_count
+
+    # Rebuild the cache from the current listing so deleted files age out.
+    new_cache = {
+        pf["path"]: {
+            "generation": pf["generation"],
+            "row_count": pf["row_count"],
+            "size_bytes": pf["size_bytes"],
+        }
+        for pf in parquet_files
+    }
+    _upload_json(client, gcs.parquet_bucket, INVENTORY_CACHE_PATH, new_cache)
+
+    # Step 4: Aggregate per feed (by base64url) with Arrow compute. The
+    # group_by runs over contiguous columns in C instead of a per-file
+    # Python loop mutating dicts of sets; ISO dates order lexicographically
+    # so string min/max give the date range directly.
+    files_table = pa.table(
+        {
+            "base64url": pa.array([pf["base64url"] for pf in parquet_files], pa.string()),
+            "date": pa.array([pf["date"] for pf in parquet_files], pa.string()),
+            "row_count": pa.array([pf["row_count"] for pf in parquet_files], pa.int64()),
+            "size_bytes": pa.array([pf["size_bytes"] for pf in parquet_files], pa.int64()),
+        }
+    )
+    aggregated = files_table.group_by("base64url").aggregate(
+        [
+            ("row_count", "sum"),
+            ("size_bytes", "sum"),
+            ("date", "min"),
+            ("date", "max"),
+        ]
+    )
 
-        if not url:
+    # Step 5: Build feeds array with a vectorized join against the feeds
+    # metadata instead of a per-feed dict lookup and dict construction.
+    # The inner join drops aggregates with no feeds.parquet entry, matching
+    # the old skip-with-warning behavior.
+    for base64url in aggregated.column("base64url").to_pylist():
+        if base64url not in feeds_lookup:
             context.log.warning(f"No URL mapping for base64url={base64url}, skipping")
-            continue
 
-        sorted_dates = sorted(agg["dates"])
-        feeds_output.append(
-            {
-                "url": url,
-                "base64url": base64url,
-                "agency_id": agg["agency_id"],
-                "agency_name": agg["agency_name"],
-                "system_id": agg["system_id"],
-                "system_name": agg["system_name"],
-                "feed_type": agg["feed_type"],
-                "date_min": sorted_dates[0] if sorted_dates else None,
-                "date_max": sorted_dates[-1] if sorted_dates else None,
-                "total_records": agg["total_records"],
-                "total_bytes": agg["total_bytes"],
-            }
+    feed_keys = list(feeds_lookup)
+    meta_columns = ["url", "agency_id", "agency_name", "system_id", "system_name", "feed_type"]
+    feeds_table = pa.table(
+        {
+            "base64url": pa.array(feed_keys, pa.string()),
+            **{
+                name: pa.array([feeds_lookup[key][name] for key in feed_keys], pa.string())
+                for name in meta_columns
+            },
+        }
+    )
+    joined = (
+        aggregated.join(feeds_table, keys="base64url", join_type="inner")
+        .select(
+            [
+                "url",
+                "base64url",
+                "agency_id",
+                "agency_name",
+                "system_id",
+                "system_name",
+                "feed_type",
+                "date_min",
+                "date_max",
+                "row_count_sum",
+                "size_bytes_sum",
+            ]
         )
-        total_records += agg["total_records"]
-        total_bytes += agg["total_bytes"]
+        .rename_columns(
+            [
+                "url",
+                "base64url",
+                "agency_id",
+                "agency_name",
+                "system_id",
+                "system_name",
+                "feed_type",
+                "date_min",
+                "date_max",
+                "total_records",
+                "total_bytes",
+            ]
+        )
+    )
+    feeds_output: list[dict[str, Any]] = joined.to_pylist()
+    total_records = sum(feed["total_records"] for feed in feeds_output)
+    total_bytes = sum(feed["total_bytes"] for feed in feeds_output)
 
     # Step 6: Upload RT inventory
     _upload_json(client, gcs.parquet_bucket, "inventory.json", feeds_output)
@@ -320,10 +505,17 @@ def _upload_json(
     client: storage.Client,
     bucket_name: str,
     filename: str,
-    data: list[dict[str, Any]],
+    data: list[dict[str, Any]] | dict[str, Any],
 ) -> None:
-    """Upload a JSON file to bucket root."""
+    """Upload a gzip-compressed JSON file to bucket root.
+
+    The consumers are tools (the gtfsrt.io site and CLI tooling), so no
+    pretty-printing; compact separators plus gzip content-encoding cut the
+    stored payload roughly 10x, and GCS transcodes on download so clients
+    still receive plain JSON.
+    """
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(filename)
-    content = json.dumps(data, indent=2)
+    blob.content_encoding = "gzip"
+    content = gzip.compress(json.dumps(data, separators=(",", ":")).encode())
     blob.upload_from_string(content, content_type="application/json")
@@ -1,4 +1,12 @@
-"""PyArrow schemas for GTFS-RT feed types."""
+"""PyArrow schemas for GTFS-RT feed types.
+
+Enum-backed fields use the narrowest integer type that holds the GTFS-RT
+value range; proto2 drops unknown enum values at parse time, so a narrower
+buffer can never see an out-of-range value. Plain integer fields
+(direction_id, occupancy_percentage, route_type, stop sequences) keep their
+wire width - a buggy feed can legally deliver any value there, and a
+narrower Arrow type would fail the whole partition at batch conversion.
+"""
 
 import pyarrow as pa
 
@@ -18,7 +26,7 @@ VEHICLE_POSITIONS_SCHEMA = pa.schema(
         pa.field("direction_id", pa.uint32()),
         pa.field("start_time", pa.string()),
         pa.field("start_date", pa.string()),
-        pa.field("schedule_relationship", pa.int32()),
+        pa.field("schedule_relationship", pa.int8()),
         # Vehicle descriptor
         pa.field("vehicle_id", pa.string()),
         pa.field("vehicle_label", pa.string()),
@@ -32,10 +40,10 @@ VEHICLE_POSITIONS_SCHEMA = pa.schema(
         # Status
         pa.field("current_stop_sequence", pa.uint32()),
         pa.field("stop_id", pa.string()),
-        pa.field("current_status", pa.int32()),
+        pa.field("current_status", pa.int8()),
         pa.field("timestamp", pa.uint64()),
-        pa.field("congestion_level", pa.int32()),
-        pa.field("occupancy_status", pa.int32()),
+        pa.field("congestion_level", pa.int8()),
+        pa.field("occupancy_status", pa.int8()),
         pa.field("occupancy_percentage", pa.uint32()),
     ]
 )
@@ -56,7 +64,7 @@ TRIP_UPDATES_SCHEMA = pa.schema(
         pa.field("direction_id", pa.uint32()),
         pa.field("start_time", pa.string()),
         pa.field("start_date", pa.string()),
-        pa.field("schedule_relationship", pa.int32()),
+        pa.field("schedule_relationship", pa.int8()),
         # Vehicle descriptor
         pa.field("vehicle_id", pa.string()),
         pa.field("vehicle_label", pa.string()),
@@ -72,7 +80,7 @@ TRIP_UPDATES_SCHEMA = pa.schema(
         pa.field("departure_delay", pa.int32()),
         pa.field("departure_time", pa.int64()),
         pa.field("departure_uncertainty", pa.int32()),
-        pa.field("stop_schedule_relationship", pa.int32()),
+        pa.field("stop_schedule_relationship", pa.int8()),
     ]
 )
 
@@ -87,9 +95,9 @@ SERVICE_ALERTS_SCHEMA = pa.schema(
         pa.field("fetch_timestamp", pa.timestamp("us", tz="UTC")),
         pa.field("entity_id", pa.string(), nullable=False),
         # Alert fields
-        pa.field("cause", pa.int32()),
-        pa.field("effect", pa.int32()),
-        pa.field("severity_level", pa.int32()),
+        pa.field("cause", pa.int8()),
+        pa.field("effect", pa.int8()),
+        pa.field("severity_level", pa.int8()),
         # Active period (first one, or null)
         pa.field("active_period_start", pa.uint64()),
         pa.field("active_period_end", pa.uint64()),
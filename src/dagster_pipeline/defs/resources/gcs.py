@@ -1,8 +1,63 @@
 """Google Cloud Storage resource for Dagster."""
 
+from functools import lru_cache
+
 import dagster as dg
+import gcsfs  # type: ignore[import-untyped]
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
 from pydantic import Field
+from requests.adapters import HTTPAdapter
+
+
+def build_pooled_client(project_id: str | None, pool_size: int) -> storage.Client:
+    """Build a GCS client with a connection pool sized for ``pool_size``.
+
+    urllib3's default pools hold only 10 connections, so heavier thread
+    fan-out over a stock client churns connections and logs "pool is full"
+    warnings.
+
+    Args:
+        project_id: GCP project, or None to use the ADC default project
+        pool_size: Connections to keep pooled per host
+
+    Returns:
+        Client whose auth session holds ``pool_size`` pooled connections
+    """
+    credentials, default_project = google.auth.default()
+    session = AuthorizedSession(credentials)  # type: ignore[no-untyped-call]
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return storage.Client(
+        project=project_id or default_project,
+        credentials=credentials,
+        _http=session,
+    )
+
+
+@lru_cache(maxsize=1)
+def _shared_client(project_id: str | None) -> storage.Client:
+    """Build the process-wide GCS client.
+
+    Constructing a client re-reads Application Default Credentials and
+    creates a fresh auth transport and connection pool, so every asset in
+    the process shares one. The pool is sized for concurrent listing
+    fan-out across assets and sensor ticks; the subprocess download path
+    sizes its own client in compaction._worker_client.
+    """
+    return build_pooled_client(project_id, 64)
+
+
+@lru_cache(maxsize=1)
+def _shared_filesystem(project_id: str | None) -> gcsfs.GCSFileSystem:
+    """Build the process-wide gcsfs filesystem.
+
+    gcsfs keeps its own aiohttp session and credential chain; sharing one
+    instance lets every asset reuse its connections and batched range-read
+    machinery instead of re-running auth discovery per run.
+    """
+    return gcsfs.GCSFileSystem(project=project_id)
 
 
 class GCSResource(dg.ConfigurableResource):  # type: ignore[type-arg]
@@ -17,5 +72,9 @@ class GCSResource(dg.ConfigurableResource):  # type: ignore[type-arg]
     parquet_bucket: str = Field(description="Bucket for compacted GTFS-RT parquet files")
 
     def get_client(self) -> storage.Client:
-        """Get a GCS client instance."""
-        return storage.Client(project=self.project_id)
+        """Get the process-wide shared GCS client."""
+        return _shared_client(self.project_id)
+
+    def get_filesystem(self) -> gcsfs.GCSFileSystem:
+        """Get the process-wide shared gcsfs filesystem."""
+        return _shared_filesystem(self.project_id)
@@ -1,5 +1,6 @@
 """Sensors for the compaction pipeline."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from typing import NamedTuple
 
@@ -86,19 +87,35 @@ def feed_discovery_sensor(
     run_requests: list[dg.RunRequest] = []
     dynamic_partitions_requests: list[dg.AddDynamicPartitionsRequest] = []
 
+    # Discovery is one paginated LIST per feed type, each latency-bound, so
+    # run the three scans concurrently and post-process serially; the tick
+    # then costs the slowest scan instead of the sum.
+    with ThreadPoolExecutor(max_workers=len(FEED_TYPE_CONFIGS)) as executor:
+        discovered_by_type = dict(
+            zip(
+                (config.feed_type for config in FEED_TYPE_CONFIGS),
+                executor.map(
+                    lambda config: discover_feed_urls(
+                        client, gcs.protobuf_bucket, config.feed_type, yesterday
+                    ),
+                    FEED_TYPE_CONFIGS,
+                ),
+                strict=True,
+            )
+        )
+
     # Process each feed type separately
     for config in FEED_TYPE_CONFIGS:
-        # Discover feeds for this type (returns base64url-encoded)
-        discovered_base64 = discover_feed_urls(
-            client, gcs.protobuf_bucket, config.feed_type, yesterday
-        )
+        discovered_base64 = discovered_by_type[config.feed_type]
 
         if not discovered_base64:
             context.log.info(f"No {config.feed_type} feeds found for {yesterday}")
             continue
 
-        # Convert to partition keys (HTTPS clean, HTTP with ~ prefix)
-        discovered_keys = {url_to_partition_key(decode_base64url(b64)) for b64 in discovered_base64}
+        # Convert to partition keys (HTTPS clean, HTTP with ~ prefix).
+        # map() over the two helpers skips the per-element name lookups a
+        # comprehension pays; the decode itself is lru_cached per feed URL.
+        discovered_keys = set(map(url_to_partition_key, map(decode_base64url, discovered_base64)))
 
         # Get currently known feeds for this type
         known_feeds = set(context.instance.get_dynamic_partitions(config.partition_name))
@@ -116,15 +133,14 @@ def feed_discovery_sensor(
             )
 
         # Create run requests for this type's asset
-        for feed_key in discovered_keys:
-            multi_key = dg.MultiPartitionKey({"date": yesterday, "feed": feed_key})
-            run_requests.append(
-                dg.RunRequest(
-                    run_key=f"{config.feed_type}_{yesterday}_{feed_key}",
-                    asset_selection=[config.asset.key],
-                    partition_key=multi_key,
-                )
+        run_requests.extend(
+            dg.RunRequest(
+                run_key=f"{config.feed_type}_{yesterday}_{feed_key}",
+                asset_selection=[config.asset.key],
+                partition_key=dg.MultiPartitionKey({"date": yesterday, "feed": feed_key}),
             )
+            for feed_key in discovered_keys
+        )
 
     if not run_requests:
         context.log.info(f"No feeds found for {yesterday}")
@@ -0,0 +1 @@
+"""Operational scripts for the Dagster pipeline."""
@@ -0,0 +1,305 @@
+"""One-time migration script to populate feed partitions from existing GCS data.
+
+This script scans the protobuf bucket for existing feeds and adds them
+to Dagster's per-type dynamic partitions store.
+
+Usage:
+    # Scan last 7 days (default)
+    uv run populate-feed-partitions
+
+    # Scan specific number of days
+    uv run populate-feed-partitions --days 30
+
+    # Dry run (show what would be added without adding)
+    uv run populate-feed-partitions --dry-run
+
+Environment variables required:
+    - DAGSTER_HOME: Path to Dagster home directory
+    - GCS_BUCKET_RT_PROTOBUF: GCS bucket containing protobuf archives
+    - GCP_PROJECT_ID: (optional) GCP project ID
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import UTC, datetime, timedelta
+from functools import cache
+
+import google.auth
+from dagster import DagsterInstance
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage
+from requests.adapters import HTTPAdapter
+
+from dagster_pipeline.defs.assets.compaction import (
+    decode_base64url,
+    iter_feed_urls,
+    url_to_partition_key,
+)
+from dagster_pipeline.defs.sensors import FEED_TYPE_CONFIGS
+
+# Feed types and their partition names, from the pipeline's canonical config
+FEED_TYPES = [(config.feed_type, config.partition_name) for config in FEED_TYPE_CONFIGS]
+
+# Scan progress goes through logging: per-day prints with flush=True would
+# interleave and serialize the thread-pool workers on stdout
+logger = logging.getLogger("populate_feed_partitions")
+
+# Max partition keys per add_dynamic_partitions call (DB parameter limit headroom)
+ADD_PARTITIONS_BATCH_SIZE = 1000
+
+# High-water-mark cursor so re-runs only scan dates not yet covered
+CURSOR_FILENAME = ".populate_feed_partitions_cursor.json"
+
+
+def load_cursor(dagster_home: str) -> str | None:
+    """Read the last successfully scanned date, if any."""
+    try:
+        with open(os.path.join(dagster_home, CURSOR_FILENAME)) as f:
+            value = json.load(f).get("last_scanned_date")
+            return str(value) if value else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_cursor(dagster_home: str, date: str) -> None:
+    """Persist the newest scanned date for the next invocation."""
+    with open(os.path.join(dagster_home, CURSOR_FILENAME), "w") as f:
+        json.dump({"last_scanned_date": date}, f)
+
+
+@cache
+def b64_to_partition_key(b64: str) -> str:
+    """Decode a base64url feed identifier to its partition key.
+
+    Memoized: the same encoded URL shows up on most scanned days, so the
+    decode/normalize work only needs to happen once per distinct feed.
+    """
+    return url_to_partition_key(decode_base64url(b64))
+
+
+def make_client() -> storage.Client:
+    """Build a GCS client with a connection pool sized for the parallel scan.
+
+    The default urllib3 pool holds 10 connections; under the 16-worker
+    listing the workers would serialize waiting for pool slots.
+    """
+    credentials, project = google.auth.default()
+    session = AuthorizedSession(credentials)  # type: ignore[no-untyped-call]
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount("https://", adapter)
+    return storage.Client(project=project, credentials=credentials, _http=session)
+
+
+def scan_dates(days: int) -> list[str]:
+    """Build the YYYY-MM-DD strings for the last ``days`` days, newest first.
+
+    "Today" is snapshotted once so a long scan cannot drift across midnight
+    and produce keys for two different windows.
+    """
+    today = datetime.now(UTC).date()
+    return [(today - timedelta(days=days_ago)).isoformat() for days_ago in range(days)]
+
+
+def discover_feeds_by_type(
+    client: storage.Client,
+    bucket_name: str,
+    dates: list[str],
+) -> dict[str, dict[str, set[str]]]:
+    """Discover feeds from GCS, organized by feed type.
+
+    Args:
+        client: GCS client
+        bucket_name: Protobuf bucket name
+        dates: Date strings (YYYY-MM-DD) to scan
+
+    Returns:
+        Dict mapping feed_type to (dict mapping partition_key to set of dates)
+    """
+    feeds_by_type: dict[str, dict[str, set[str]]] = {
+        feed_type: defaultdict(set) for feed_type, _ in FEED_TYPES
+    }
+
+    def scan(feed_type: str, date: str) -> tuple[str, str, set[str]]:
+        """Stream one (feed_type, date) listing, decoding keys as pages arrive."""
+        keys: set[str] = set()
+        for b64 in iter_feed_urls(client, bucket_name, feed_type, date):
+            try:
+                keys.add(b64_to_partition_key(b64))
+            except Exception as e:
+                logger.warning("Failed to decode %s: %s", b64, e)
+        return feed_type, date, keys
+
+    # Each scan is a blocking GCS list request, so the (date, feed_type) pairs
+    # are network-bound and parallelize nearly linearly. Results are merged in
+    # the main thread as futures complete, so no locking is needed.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [
+            executor.submit(scan, feed_type, date)
+            for date in dates
+            for feed_type, _ in FEED_TYPES
+        ]
+        for future in as_completed(futures):
+            feed_type, date, partition_keys = future.result()
+
+            for partition_key in partition_keys:
+                feeds_by_type[feed_type][partition_key].add(date)
+
+            logger.info("Scanned %s for %s: found %d feeds", feed_type, date, len(partition_keys))
+
+    return feeds_by_type
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Populate Dagster feed partitions from existing GCS data"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Number of days to scan (default: 7)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be added without making changes",
+    )
+    parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Ignore the saved cursor and rescan the full date window",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="List every discovered feed instead of per-type counts",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="  %(levelname)s %(message)s")
+
+    # Check required environment variables
+    dagster_home = os.environ.get("DAGSTER_HOME")
+    bucket_name = os.environ.get("GCS_BUCKET_RT_PROTOBUF")
+
+    if not dagster_home:
+        print("Error: DAGSTER_HOME environment variable not set")
+        print("Set it to an absolute path, e.g.: export DAGSTER_HOME=$PWD/.dagster_home")
+        sys.exit(1)
+
+    if not bucket_name:
+        print("Error: GCS_BUCKET_RT_PROTOBUF environment variable not set")
+        sys.exit(1)
+
+    # Narrow the scan window to dates newer than the saved high-water mark,
+    # so steady-state re-runs only list the incremental days
+    dates = scan_dates(args.days)
+    if not dates:
+        # argparse happily accepts --days 0; treat the empty window as a
+        # clean no-op rather than indexing into an empty list below
+        print("No days to scan, nothing to do.")
+        sys.exit(0)
+    if not args.full_rescan:
+        last_scanned = load_cursor(dagster_home)
+        if last_scanned:
+            dates = [d for d in dates if d > last_scanned]
+            if not dates:
+                print(f"Already scanned through {last_scanned}, nothing new to do.")
+                print("Use --full-rescan to rescan the full window.")
+                sys.exit(0)
+
+    print(f"Dagster home: {dagster_home}")
+    print(f"Protobuf bucket: {bucket_name}")
+    print(f"Scanning {len(dates)} days ({dates[-1]} to {dates[0]})...")
+    print()
+
+    # Initialize GCS client
+    client = make_client()
+
+    # Discover feeds from GCS
+    print("Discovering feeds from GCS:")
+    feeds_by_type = discover_feeds_by_type(client, bucket_name, dates)
+
+    total_feeds = sum(len(feeds) for feeds in feeds_by_type.values())
+    if total_feeds == 0:
+        print("\nNo feeds found in GCS data.")
+        # A dry run must not move the incremental-scan cursor, or real runs
+        # would silently skip the dates it covered
+        if not args.dry_run:
+            save_cursor(dagster_home, dates[0])
+        sys.exit(0)
+
+    # Compute the new-feed diff once so the same data feeds both the display
+    # and the registration below. Membership is checked per candidate key via
+    # the indexed has_dynamic_partition lookup rather than loading every
+    # existing partition key into memory - on instances with tens of
+    # thousands of partitions the full fetch dwarfs the O(candidates) probes.
+    instance = DagsterInstance.get()
+    new_by_type: dict[str, list[str]] = {}
+    for feed_type, partition_name in FEED_TYPES:
+        new_by_type[feed_type] = [
+            key
+            for key in sorted(feeds_by_type[feed_type])
+            if not instance.has_dynamic_partition(partition_name, key)
+        ]
+
+    # Sorting thousands of keys just for display is wasted work, so the
+    # per-feed listing is opt-in
+    print("\nDiscovered feeds by type:")
+    for feed_type, _partition_name in FEED_TYPES:
+        feeds = feeds_by_type[feed_type]
+        print(f"  {feed_type}: {len(feeds)} feeds, {len(new_by_type[feed_type])} new")
+        if args.verbose:
+            for feed, seen_dates in sorted(feeds.items()):
+                print(f"    - {feed} (seen on {len(seen_dates)} days)")
+
+    if args.dry_run:
+        print("\n[DRY RUN] Would add the new feeds above to Dagster dynamic partitions.")
+        print("Run without --dry-run to apply changes.")
+        sys.exit(0)
+
+    # Add to Dagster dynamic partitions - one batched call per feed type,
+    # chunked to stay under DB parameter limits on large backfills
+    print("\nAdding feeds to Dagster dynamic partitions...")
+
+    total_added = 0
+    for feed_type, partition_name in FEED_TYPES:
+        new_feeds = new_by_type[feed_type]
+        if not feeds_by_type[feed_type]:
+            print(f"  {feed_type}: no feeds to add")
+            continue
+
+        if not new_feeds:
+            print(
+                f"  {feed_type}: all {len(feeds_by_type[feed_type])} "
+                "discovered feeds already registered"
+            )
+            continue
+
+        print(f"  {feed_type}: adding {len(new_feeds)} new feeds")
+
+        for start in range(0, len(new_feeds), ADD_PARTITIONS_BATCH_SIZE):
+            instance.add_dynamic_partitions(
+                partitions_def_name=partition_name,
+                partition_keys=new_feeds[start : start + ADD_PARTITIONS_BATCH_SIZE],
+            )
+        total_added += len(new_feeds)
+
+    save_cursor(dagster_home, dates[0])
+
+    print(f"\nSuccessfully added {total_added} feed partitions!")
+    print("\nNext steps:")
+    print("  1. Enable the feed_discovery_sensor in Dagster UI")
+    print(
+        "  2. Or run: uv run dg launch --assets vehicle_positions_parquet "
+        "--partition '2026-01-03|example.com/feed'"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """Main entry point for GTFS-RT Archiver."""
 
 import asyncio
+import contextlib
 import signal
+import time
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
@@ -21,6 +23,7 @@ from gtfs_rt_archiver.config import (
     resolve_feed_secrets,
 )
 from gtfs_rt_archiver.fetcher import (
+    FetchResult,
     NonRetryableError,
     create_http_client,
     fetch_feed,
@@ -50,50 +53,80 @@ from gtfs_rt_archiver.storage import StorageWriter
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
 
+# How often the scheduler gauges are refreshed in the background
+GAUGE_REFRESH_SECONDS = 30
+
 
 async def create_fetch_job(
     http_client: httpx.AsyncClient,
     storage_writer: StorageWriter,
-    semaphore: asyncio.Semaphore,
+    fetch_semaphore: asyncio.Semaphore,
+    upload_semaphore: asyncio.Semaphore,
 ) -> "FetchJobCallable":
     """Create the fetch job function.
 
+    Fetch and upload concurrency are limited separately: an upload stuck in
+    retry backoff can idle for tens of seconds, and holding a fetch slot
+    through that would starve other feeds of fetch throughput.
+
     Args:
         http_client: HTTP client for fetching feeds.
         storage_writer: Storage writer for uploading to GCS.
-        semaphore: Semaphore to limit concurrent fetch operations.
+        fetch_semaphore: Semaphore to limit concurrent fetch operations.
+        upload_semaphore: Semaphore to limit concurrent upload operations.
 
     Returns:
         Async function to fetch and store a feed.
     """
     logger = get_logger(__name__)
 
+    # Retry on network/IO errors only (not programming errors). Defined once
+    # here so each fetch reuses the wrapper instead of building a fresh
+    # tenacity controller per upload.
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1.0, max=10.0),
+        retry=retry_if_exception_type((ClientError, TimeoutError, ConnectionError)),
+        reraise=True,
+    )
+    async def upload_with_retry(feed: FeedConfig, result: FetchResult) -> str:
+        return await storage_writer.write(feed, result)
+
     async def fetch_job(feed: FeedConfig, scheduled_time: datetime) -> None:
         """Fetch a single feed and upload to storage."""
+        # Bind the hot attributes once; they feed a dozen metric and log
+        # calls below and pydantic attribute access is not free.
+        feed_id = feed.id
         feed_type = feed.feed_type.value
         agency = feed.agency_id
 
         # Record scheduler delay (before semaphore acquisition)
         job_start = datetime.now(UTC)
         scheduler_delay_secs = (job_start - scheduled_time).total_seconds()
-        record_scheduler_delay(feed.id, feed_type, agency, scheduler_delay_secs)
+        record_scheduler_delay(feed_id, feed_type, agency, scheduler_delay_secs)
 
-        # Acquire semaphore to limit concurrent operations
-        async with semaphore:
+        # Acquire the fetch semaphore for the fetch phase only; the upload
+        # phase below is gated separately so a slow or retrying upload
+        # doesn't occupy a fetch slot while it sleeps
+        async with fetch_semaphore:
             # Record queue delay (time waiting for semaphore)
             semaphore_acquired = datetime.now(UTC)
             queue_delay_secs = (semaphore_acquired - job_start).total_seconds()
-            record_queue_delay(feed.id, feed_type, agency, queue_delay_secs)
+            record_queue_delay(feed_id, feed_type, agency, queue_delay_secs)
 
             # Record total delay (scheduler + queue)
             total_delay_secs = (semaphore_acquired - scheduled_time).total_seconds()
-            record_total_delay(feed.id, feed_type, agency, total_delay_secs)
+            record_total_delay(feed_id, feed_type, agency, total_delay_secs)
 
-            # Start processing time measurement
-            processing_start = datetime.now(UTC)
+            # Start processing time measurement. Durations use the monotonic
+            # perf counter — datetime math here allocated two datetimes and a
+            # timedelta per measurement just to get elapsed seconds, and
+            # wall-clock steps would skew it. datetime.now(UTC) remains only
+            # where an absolute timestamp is compared against scheduled_time.
+            processing_start = time.perf_counter()
 
             # Record attempt inside semaphore for accurate concurrency metrics
-            record_fetch_attempt(feed.id, feed_type, agency)
+            record_fetch_attempt(feed_id, feed_type, agency)
 
             try:
                 # Fetch the feed
@@ -101,7 +134,7 @@ async def create_fetch_job(
 
                 # Record successful fetch
                 record_fetch_success(
-                    feed.id,
+                    feed_id,
                     feed_type,
                     agency,
                     result.duration_ms / 1000.0,
@@ -110,101 +143,97 @@ async def create_fetch_job(
 
                 logger.info(
                     "fetch_success",
-                    feed_id=feed.id,
+                    feed_id=feed_id,
                     feed_type=feed_type,
                     duration_ms=result.duration_ms,
                     content_length=result.content_length,
                 )
 
-                # Record upload attempt before trying
-                record_upload_attempt(feed.id, feed_type, agency)
-
-                # Upload to storage with retry
-                upload_start = datetime.now(UTC)
-                try:
-                    # Retry on network/IO errors only (not programming errors)
-                    @retry(
-                        stop=stop_after_attempt(3),
-                        wait=wait_exponential(multiplier=1.0, max=10.0),
-                        retry=retry_if_exception_type((ClientError, TimeoutError, ConnectionError)),
-                        reraise=True,
-                    )
-                    async def upload_with_retry() -> str:
-                        return await storage_writer.write(feed, result)
-
-                    path = await upload_with_retry()
-                    upload_duration = (datetime.now(UTC) - upload_start).total_seconds()
-
-                    record_upload_success(feed.id, feed_type, agency, upload_duration)
-
-                    # Record processed bytes with content_type
-                    content_type = result.content_type or "unknown"
-                    record_processed_bytes(
-                        feed.id, feed_type, agency, content_type, result.content_length
-                    )
-
-                    logger.info(
-                        "upload_success",
-                        feed_id=feed.id,
-                        path=path,
-                        duration_seconds=upload_duration,
-                    )
-
-                    # Record successful fetch+upload cycle for /health/feeds
-                    record_feed_success(feed.id)
-
-                except Exception as e:
-                    record_upload_error(feed.id, feed_type, agency, type(e).__name__)
-                    logger.error(
-                        "upload_error",
-                        feed_id=feed.id,
-                        error_type=type(e).__name__,
-                        error_message=str(e),
-                    )
-
-                # Record end-to-end processing time (fetch + upload)
-                processing_duration = (datetime.now(UTC) - processing_start).total_seconds()
-                record_processing_time(feed.id, feed_type, agency, processing_duration)
-
             except NonRetryableError as e:
                 error_type = f"http_{e.status_code}"
-                record_fetch_error(feed.id, feed_type, agency, error_type)
+                record_fetch_error(feed_id, feed_type, agency, error_type)
                 logger.warning(
                     "fetch_non_retryable",
-                    feed_id=feed.id,
+                    feed_id=feed_id,
                     status_code=e.status_code,
                 )
+                return
 
             except httpx.TimeoutException:
-                record_fetch_error(feed.id, feed_type, agency, "timeout")
-                logger.error("fetch_timeout", feed_id=feed.id)
+                record_fetch_error(feed_id, feed_type, agency, "timeout")
+                logger.error("fetch_timeout", feed_id=feed_id)
+                return
 
             except httpx.TransportError as e:
-                record_fetch_error(feed.id, feed_type, agency, "transport")
+                record_fetch_error(feed_id, feed_type, agency, "transport")
                 logger.error(
                     "fetch_transport_error",
-                    feed_id=feed.id,
+                    feed_id=feed_id,
                     error_type=type(e).__name__,
                     error_message=str(e),
                 )
+                return
 
             except httpx.HTTPStatusError as e:
                 error_type = f"http_{e.response.status_code}"
-                record_fetch_error(feed.id, feed_type, agency, error_type)
+                record_fetch_error(feed_id, feed_type, agency, error_type)
                 logger.error(
                     "fetch_http_error",
-                    feed_id=feed.id,
+                    feed_id=feed_id,
                     status_code=e.response.status_code,
                 )
+                return
 
             except Exception as e:
-                record_fetch_error(feed.id, feed_type, agency, "unknown")
+                record_fetch_error(feed_id, feed_type, agency, "unknown")
                 logger.exception(
                     "fetch_unknown_error",
-                    feed_id=feed.id,
+                    feed_id=feed_id,
                     error_type=type(e).__name__,
                     error_message=str(e),
                 )
+                return
+
+        # Record upload attempt before trying
+        record_upload_attempt(feed_id, feed_type, agency)
+
+        # Upload to storage with retry, under the upload semaphore
+        async with upload_semaphore:
+            upload_start = time.perf_counter()
+            try:
+                path = await upload_with_retry(feed, result)
+                upload_duration = time.perf_counter() - upload_start
+
+                record_upload_success(feed_id, feed_type, agency, upload_duration)
+
+                # Record processed bytes with content_type
+                content_type = result.content_type or "unknown"
+                record_processed_bytes(
+                    feed_id, feed_type, agency, content_type, result.content_length
+                )
+
+                logger.info(
+                    "upload_success",
+                    feed_id=feed_id,
+                    path=path,
+                    duration_seconds=upload_duration,
+                )
+
+                # Record successful fetch+upload cycle for /health/feeds
+                record_feed_success(feed_id)
+
+            except Exception as e:
+                record_upload_error(feed_id, feed_type, agency, type(e).__name__)
+                logger.error(
+                    "upload_error",
+                    feed_id=feed_id,
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                )
+
+        # Record end-to-end processing time (fetch + upload)
+        processing_duration = time.perf_counter() - processing_start
+        record_processing_time(feed_id, feed_type, agency, processing_duration)
 
     return fetch_job
 
@@ -257,11 +286,13 @@ async def run() -> None:
         bucket=settings.gcs_bucket,
     )
 
-    # Create semaphore for concurrency limiting
-    semaphore = asyncio.Semaphore(settings.max_concurrent)
+    # Create semaphores for concurrency limiting. Uploads get a larger
+    # budget of their own so retry backoff never blocks fetch slots.
+    fetch_semaphore = asyncio.Semaphore(settings.max_concurrent)
+    upload_semaphore = asyncio.Semaphore(settings.max_concurrent * 2)
 
     # Create fetch job
-    fetch_job = await create_fetch_job(http_client, storage_writer, semaphore)
+    fetch_job = await create_fetch_job(http_client, storage_writer, fetch_semaphore, upload_semaphore)
 
     # Create scheduler
     scheduler = FeedScheduler(
@@ -287,6 +318,17 @@ async def run() -> None:
     signal.signal(signal.SIGTERM, handle_shutdown)
     signal.signal(signal.SIGINT, handle_shutdown)
 
+    # Refresh the scheduler gauges periodically so they track feed changes
+    # over the process lifetime instead of going stale after a one-shot
+    # startup sample, without touching the per-fetch hot path.
+    async def refresh_gauges() -> None:
+        while True:
+            set_active_feeds(len(scheduler.active_feeds))
+            set_scheduler_jobs(scheduler.get_job_count())
+            await asyncio.sleep(GAUGE_REFRESH_SECONDS)
+
+    gauge_task: asyncio.Task[None] | None = None
+
     try:
         # Start services
         await health_server.start()
@@ -298,9 +340,8 @@ async def run() -> None:
             active_feeds=len(scheduler.active_feeds),
         )
 
-        # Update metrics
-        set_active_feeds(len(scheduler.active_feeds))
-        set_scheduler_jobs(scheduler.get_job_count())
+        # Keep metrics updated in the background
+        gauge_task = asyncio.create_task(refresh_gauges())
 
         # Wait for shutdown signal
         await shutdown_event.wait()
@@ -309,6 +350,11 @@ async def run() -> None:
         # Graceful shutdown
         logger.info("shutting_down")
 
+        if gauge_task is not None:
+            gauge_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await gauge_task
+
         await scheduler.stop(wait=True)
         logger.info("scheduler_stopped")
 
@@ -1,10 +1,14 @@
 """Tests for Dagster compaction functions."""
 
+from typing import Any
+
+import pyarrow as pa
 import pytest
 from google.protobuf.message import DecodeError
 from google.transit import gtfs_realtime_pb2
 
 from dagster_pipeline.defs.assets.compaction import (
+    ColumnBuilder,
     decode_base64url,
     encode_base64url,
     extract_service_alerts,
@@ -16,6 +20,14 @@ from dagster_pipeline.defs.assets.compaction import (
 )
 
 
+def to_rows(columns: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Rehydrate an extractor's per-column lists into row dicts for assertions."""
+    return [
+        dict(zip(columns, values, strict=True))
+        for values in zip(*columns.values(), strict=True)
+    ]
+
+
 class TestDecodeBase64url:
     """Tests for base64url decoding."""
 
@@ -136,6 +148,39 @@ class TestPartitionKeyToUrl:
         assert recovered_base64 == original_base64
 
 
+class TestColumnBuilder:
+    """Tests for column-wise record batch building."""
+
+    SCHEMA = pa.schema(
+        [
+            pa.field("name", pa.string(), nullable=False),
+            pa.field("count", pa.int64(), nullable=True),
+        ]
+    )
+
+    def test_builds_batch_from_records(self) -> None:
+        """Test that appended records come back as a typed RecordBatch."""
+        builder = ColumnBuilder(self.SCHEMA)
+        builder.append({"name": "a", "count": 1})
+        builder.append({"name": "b", "count": None})
+        assert builder.num_rows == 2
+
+        batch = builder.finish()
+        assert batch.schema == self.SCHEMA
+        assert batch.column("name").to_pylist() == ["a", "b"]
+        assert batch.column("count").to_pylist() == [1, None]
+
+    def test_finish_resets_builder(self) -> None:
+        """Test that finish clears accumulated state for reuse."""
+        builder = ColumnBuilder(self.SCHEMA)
+        builder.append({"name": "a", "count": 1})
+        builder.finish()
+
+        assert builder.num_rows == 0
+        batch = builder.finish()
+        assert batch.num_rows == 0
+
+
 class TestParseProtobuf:
     """Tests for protobuf parsing."""
 
@@ -168,7 +213,7 @@ class TestExtractVehiclePositions:
         self, sample_vehicle_position_feed: gtfs_realtime_pb2.FeedMessage
     ) -> None:
         """Test extracting vehicle positions with all fields."""
-        records = list(
+        records = to_rows(
             extract_vehicle_positions(
                 sample_vehicle_position_feed,
                 "test/file.pb",
@@ -202,7 +247,7 @@ class TestExtractVehiclePositions:
         self, sample_vehicle_position_feed: gtfs_realtime_pb2.FeedMessage
     ) -> None:
         """Test extracting vehicle position with minimal fields."""
-        records = list(
+        records = to_rows(
             extract_vehicle_positions(
                 sample_vehicle_position_feed,
                 "test/file.pb",
@@ -224,7 +269,7 @@ class TestExtractVehiclePositions:
 
     def test_extract_empty_feed(self, empty_feed: gtfs_realtime_pb2.FeedMessage) -> None:
         """Test extracting from empty feed."""
-        records = list(extract_vehicle_positions(empty_feed, "test.pb", "http://test", None))
+        records = to_rows(extract_vehicle_positions(empty_feed, "test.pb", "http://test", None))
         assert records == []
 
 
@@ -235,7 +280,7 @@ class TestExtractTripUpdates:
         self, sample_trip_update_feed: gtfs_realtime_pb2.FeedMessage
     ) -> None:
         """Test extracting trip updates with stop time updates (denormalized)."""
-        records = list(
+        records = to_rows(
             extract_trip_updates(
                 sample_trip_update_feed,
                 "test/file.pb",
@@ -272,7 +317,7 @@ class TestExtractTripUpdates:
         self, sample_trip_update_feed: gtfs_realtime_pb2.FeedMessage
     ) -> None:
         """Test extracting trip update without stop time updates."""
-        records = list(
+        records = to_rows(
             extract_trip_updates(
                 sample_trip_update_feed,
                 "test/file.pb",
@@ -291,7 +336,7 @@ class TestExtractTripUpdates:
 
     def test_extract_empty_feed(self, empty_feed: gtfs_realtime_pb2.FeedMessage) -> None:
         """Test extracting from empty feed."""
-        records = list(extract_trip_updates(empty_feed, "test.pb", "http://test", None))
+        records = to_rows(extract_trip_updates(empty_feed, "test.pb", "http://test", None))
         assert records == []
 
 
@@ -302,7 +347,7 @@ class TestExtractServiceAlerts:
         self, sample_service_alert_feed: gtfs_realtime_pb2.FeedMessage
     ) -> None:
         """Test extracting service alerts with informed entities (denormalized)."""
-        records = list(
+        records = to_rows(
             extract_service_alerts(
                 sample_service_alert_feed,
                 "test/file.pb",
@@ -337,7 +382,7 @@ class TestExtractServiceAlerts:
         self, sample_service_alert_feed: gtfs_realtime_pb2.FeedMessage
     ) -> None:
         """Test extracting service alert without informed entities."""
-        records = list(
+        records = to_rows(
             extract_service_alerts(
                 sample_service_alert_feed,
                 "test/file.pb",
@@ -356,5 +401,5 @@ class TestExtractServiceAlerts:
 
     def test_extract_empty_feed(self, empty_feed: gtfs_realtime_pb2.FeedMessage) -> None:
         """Test extracting from empty feed."""
-        records = list(extract_service_alerts(empty_feed, "test.pb", "http://test", None))
+        records = to_rows(extract_service_alerts(empty_feed, "test.pb", "http://test", None))
         assert records == []
@@ -68,7 +68,8 @@ class TestCreateFetchJob:
 
         async with httpx.AsyncClient() as client:
             semaphore = asyncio.Semaphore(10)
-            fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+            upload_semaphore = asyncio.Semaphore(10)
+            fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
             scheduled_time = datetime.now(UTC)
 
             await fetch_job(feed_config, scheduled_time)
@@ -96,7 +97,8 @@ class TestCreateFetchJob:
         ):
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
                 await fetch_job(feed_config, scheduled_time)
 
@@ -118,7 +120,8 @@ class TestCreateFetchJob:
         with patch("gtfs_rt_archiver.__main__.record_fetch_error") as mock_error:
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
 
                 # Should not raise
@@ -143,7 +146,8 @@ class TestCreateFetchJob:
         with patch("gtfs_rt_archiver.__main__.record_fetch_error") as mock_error:
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
 
                 # Should not raise
@@ -167,7 +171,8 @@ class TestCreateFetchJob:
         with patch("gtfs_rt_archiver.__main__.record_fetch_error") as mock_error:
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
 
                 # Should not raise
@@ -201,7 +206,8 @@ class TestCreateFetchJob:
         with patch("gtfs_rt_archiver.__main__.record_fetch_error") as mock_error:
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
 
                 # Should not raise
@@ -227,7 +233,8 @@ class TestCreateFetchJob:
         with patch("gtfs_rt_archiver.__main__.record_upload_error") as mock_error:
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
 
                 # Should not raise
@@ -243,15 +250,16 @@ class TestCreateFetchJob:
         self,
         mock_storage_writer: AsyncMock,
     ) -> None:
-        """Test that semaphore limits concurrent operations."""
+        """Test that the semaphores limit concurrent operations."""
         respx.get("https://example.com/feed.pb").mock(
             return_value=Response(200, content=b"content")
         )
 
         async with httpx.AsyncClient() as client:
-            # Semaphore with limit of 2
+            # Fetch and upload semaphores each with a limit of 2
             semaphore = asyncio.Semaphore(2)
-            fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+            upload_semaphore = asyncio.Semaphore(2)
+            fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
             scheduled_time = datetime.now(UTC)
 
             # Track concurrent executions
@@ -283,7 +291,7 @@ class TestCreateFetchJob:
 
             await asyncio.gather(*[fetch_job(f, scheduled_time) for f in feeds])
 
-            # Max concurrent should not exceed semaphore limit
+            # Max concurrent writes should not exceed the upload semaphore limit
             assert max_concurrent <= 2
 
     @respx.mock
@@ -298,7 +306,8 @@ class TestCreateFetchJob:
         with patch("gtfs_rt_archiver.__main__.record_fetch_error") as mock_error:
             async with httpx.AsyncClient() as client:
                 semaphore = asyncio.Semaphore(10)
-                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore)
+                upload_semaphore = asyncio.Semaphore(10)
+                fetch_job = await create_fetch_job(client, mock_storage_writer, semaphore, upload_semaphore)
                 scheduled_time = datetime.now(UTC)
 
                 # Should not raise